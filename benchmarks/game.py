@@ -0,0 +1,196 @@
+"""
+Offline game benchmark: the bots against a local replica of the game page, and their strategy on its own.
+
+The replica (benchmarks/replica/index.html) is served from a localhost server, or opened over file://, so no network
+access is needed. Every bot, CookieClickerBot ("sync") and AsyncCookieClickerBot ("async"), plays one instrumented
+headless game with every click engine; the results are printed as JSON, keyed by the engine for the sync bot and by
+async-<engine> for the async one, and the exit code is 1 when a metric is worse than in a --baseline file by more
+than --tolerance.
+
+    python benchmarks/game.py --time 10 --output baseline.json
+    python benchmarks/game.py --time 10 --baseline baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import pathlib
+import sys
+import time
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)  # the benchmark is run as a script
+
+import numpy as np  # noqa: E402
+from core import strategy  # noqa: E402
+from core.page_server import PageServer, REPLICA_DIR  # noqa: E402
+from core.simulator import BASE_COSTS  # noqa: E402
+
+# Metrics compared with the baseline: True when higher is better.
+HIGHER_IS_BETTER = {
+    "clicks_per_s": True,
+    "decisions_per_s": True,
+    "purchase_latency_p50_ms": False,
+    "first_click_s": False,
+}
+
+
+def benchmark_strategy(seconds: float = 1.0, batch_size: int = 10000) -> Dict[str, float]:
+    """
+    Measure how many upgrade decisions the strategy makes per second, one by one and in batches.
+
+    :param seconds: Time spent on each measurement (default is 1.0).
+    :type seconds: float
+    :param batch_size: Ratios evaluated per batch (default is 10000).
+    :type batch_size: int
+    :return: Decisions per second of ultimate_strategy and ultimate_strategy_batch.
+    :rtype: dict[str, float]
+    """
+    prices = list(BASE_COSTS)
+    ratios = np.linspace(0, 1, batch_size)
+
+    decisions = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for ratio in ratios[:1000]:
+            strategy.ultimate_strategy(prices, ratio)
+        decisions += 1000
+    scalar = decisions / (time.perf_counter() - start)
+
+    decisions = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        strategy.ultimate_strategy_batch(prices, ratios)
+        decisions += batch_size
+    batch = decisions / (time.perf_counter() - start)
+
+    return {"decisions_per_s": round(scalar), "batch_decisions_per_s": round(batch)}
+
+
+def benchmark_game(url: str, engine: str, duration: int, ratio: float, bot: str = "sync") -> Dict[str, float]:
+    """
+    Play one instrumented headless game on the replica and extract its metrics.
+
+    :param url: Address of the replica.
+    :type url: str
+    :param engine: Click engine of the bot, a key of CLICK_ENGINES.
+    :type engine: str
+    :param duration: Duration of the game in seconds.
+    :type duration: int
+    :param ratio: The ratio for upgrade buying.
+    :type ratio: float
+    :param bot: "sync" to play with CookieClickerBot, "async" with AsyncCookieClickerBot (default is "sync").
+    :type bot: str
+    :return: CPS, clicks, decisions and purchases per second, purchase latency and time to the first click.
+    :rtype: dict[str, float]
+    """
+    from core.async_bot import AsyncCookieClickerBot
+    from core.bot import CookieClickerBot
+    from core.pool import DriverPool
+
+    bot_class = AsyncCookieClickerBot if bot == "async" else CookieClickerBot
+    pool = DriverPool(headless=True, url=url)
+    try:
+        bot = bot_class(ratio_enabled=True, click_enabled=True, click_engine=engine, headless=True, pool=pool,
+                               instrument=True)
+        cps = bot.game(ratio=ratio, duration=duration, save_score=False)
+    finally:
+        pool.close()
+
+    report = bot.metrics_report
+    elapsed = max(report["elapsed_s"], 1e-9)
+    upgrade = report["phases"].get("upgrade", {})
+    return {
+        "cps": cps,
+        "clicks_per_s": report["rates"]["clicks_per_s"],
+        "decisions_per_s": round(report["phases"].get("ultimate_strategy", {}).get("count", 0) / elapsed, 1),
+        "purchases": report["counters"]["purchases"],
+        "purchases_per_s": report["rates"]["purchases_per_s"],
+        "purchase_latency_p50_ms": upgrade.get("p50_ms"),
+        "purchase_latency_p99_ms": upgrade.get("p99_ms"),
+        "first_click_s": report["first_click_s"],
+    }
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    List the metrics of the games that got worse than in the baseline by more than the tolerance.
+
+    :param result: Results of this run.
+    :type result: dict
+    :param baseline: Results of an earlier run.
+    :type baseline: dict
+    :param tolerance: Allowed change as a fraction, e.g. 0.2 for 20%.
+    :type tolerance: float
+    :return: A description of every regression.
+    :rtype: list[str]
+    """
+    regressions = []
+    for engine, metrics in result["games"].items():
+        for metric, higher_is_better in HIGHER_IS_BETTER.items():
+            old = baseline.get("games", {}).get(engine, {}).get(metric)
+            new = metrics.get(metric)
+            if old is None or new is None:
+                continue
+            worse = new < old * (1 - tolerance) if higher_is_better else new > old * (1 + tolerance)
+            if worse:
+                regressions.append(f"{engine} {metric}: {old} -> {new}")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Run the benchmark and print the results.
+
+    :param argv: Command line arguments (default is None, sys.argv is used).
+    :type argv: list[str] or None
+    :return: Exit code, 1 on a regression.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the bot against a local replica of the game page.")
+    parser.add_argument("--time", type=int, default=10, help="game time in seconds")
+    parser.add_argument("--ratio", type=float, default=0.5)
+    parser.add_argument("--engines", nargs="+", default=["selenium", "javascript"])
+    parser.add_argument("--bots", nargs="+", choices=("sync", "async"), default=["sync", "async"])
+    parser.add_argument("--transport", choices=("http", "file"), default="http", help="how the replica is served")
+    parser.add_argument("--strategy-only", action="store_true", help="skip the browser games")
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed change before a regression")
+    args = parser.parse_args(argv)
+
+    result = {"benchmark": "game", "time": args.time, "ratio": args.ratio, "transport": args.transport,
+              "strategy": benchmark_strategy(), "games": {}}
+    if not args.strategy_only:
+        server = None
+        if args.transport == "http":
+            server = PageServer(REPLICA_DIR)
+            url = server.start()
+        else:
+            url = pathlib.Path(REPLICA_DIR, "index.html").as_uri()
+        try:
+            for bot in args.bots:
+                for engine in args.engines:
+                    key = engine if bot == "sync" else f"{bot}-{engine}"
+                    result["games"][key] = benchmark_game(url, engine, args.time, args.ratio, bot)
+        finally:
+            if server is not None:
+                server.stop()
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(result, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
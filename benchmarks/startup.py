@@ -0,0 +1,89 @@
+"""
+Startup benchmark: how long it takes to import the app and to show the main window.
+
+Every run starts a fresh interpreter from the project root. The results are printed as JSON, and the exit code is 1
+when the median time to the window exceeds --max-seconds or a heavy module is imported before the window shows up.
+
+    python benchmarks/startup.py --runs 5 --max-seconds 1.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported before the main window is shown.
+HEAVY_MODULES = ("pandas", "numpy", "selenium", "keyboard")
+
+# Runs in the fresh interpreter: the startup path of main.py, timed.
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import tkinter as tk
+from gui.gui import CookieClickerBotApp
+imported = time.perf_counter() - start
+window = None
+try:
+    root = tk.Tk()
+    shown = []
+    root.bind("<Map>", lambda event: shown.append(time.perf_counter()) if event.widget is root else None)
+    app = CookieClickerBotApp(root)
+    while not shown:
+        root.update()
+    window = shown[0] - start
+    root.destroy()
+except tk.TclError:  # no display, only the import time is measured
+    pass
+print(json.dumps({"import_seconds": imported, "window_seconds": window,
+                  "heavy_modules": [module for module in %r if module in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def measure() -> Dict:
+    """
+    Start the app once in a fresh interpreter and time it.
+
+    :return: Import time, time until the window is shown (None without a display) and heavy modules imported.
+    :rtype: dict
+    """
+    output = subprocess.run([sys.executable, "-c", CHILD_SCRIPT], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Run the benchmark and print the results.
+
+    :param argv: Command line arguments (default is None, sys.argv is used).
+    :type argv: list[str] or None
+    :return: Exit code, 1 on a regression.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Measure the startup time of the app.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail above this median time to the window")
+    args = parser.parse_args(argv)
+
+    runs = [measure() for _ in range(args.runs)]
+    windows = [run["window_seconds"] for run in runs if run["window_seconds"] is not None]
+    result = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "import_seconds": statistics.median(run["import_seconds"] for run in runs),
+        "window_seconds": statistics.median(windows) if windows else None,
+        "heavy_modules": sorted({module for run in runs for module in run["heavy_modules"]}),
+    }
+    print(json.dumps(result, indent=2))
+
+    limit = result["window_seconds"] if result["window_seconds"] is not None else result["import_seconds"]
+    too_slow = args.max_seconds is not None and limit > args.max_seconds
+    return 1 if too_slow or result["heavy_modules"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,65 @@
-from pygetwindow import Win32Window
-
-from core.bot import CookieClickerBot
-from core.clock import Timer
-from core.score import GameScoreManager
-from tkinter import ttk
+from core.clock import GameClock, Timer
+from core.events import ABORTED, EventBus, FAILED, FINISHED, PURCHASE, READY, STATS
+from gui.stats_panel import StatsPanel
 from tkinter import messagebox
 import tkinter as tk
 import threading
-import pygetwindow as gw
-from selenium.common.exceptions import NoSuchWindowException
-from typing import List
+import atexit
+import importlib
+
+
+# Heavy modules are imported when they are first needed (selenium when Play is pressed, pandas when the leaderboard
+# is opened), so that the main window shows up first. preload_modules() warms them up once the window is shown.
+HEAVY_MODULES = ("core.bot", "gui.leaderboard")
+
+driver_pool = None  # keeps the browser warm between games, created for the first game
+driver_pool_lock = threading.Lock()
+
+
+def preload_modules() -> None:
+    """
+    Import the heavy modules in a background thread, so that the first game or leaderboard opens faster.
+
+    :return: None
+    """
+    def preload() -> None:
+        """
+        Import the heavy modules one by one. A module that fails to import is left to fail when it is really needed.
+
+        :return: None
+        """
+        for module in HEAVY_MODULES:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+
+    threading.Thread(target=preload, daemon=True).start()
+
+
+def get_driver_pool():
+    """
+    Retrieve the pool of browser sessions shared by the games, creating it for the first game.
+
+    :return: The driver pool.
+    :rtype: DriverPool
+    """
+    global driver_pool
+    with driver_pool_lock:
+        if driver_pool is None:
+            from core.pool import DriverPool
+            driver_pool = DriverPool()
+            atexit.register(driver_pool.close)
+        return driver_pool
 
 
 def play_game(is_bot_on: int, is_ratio_on: int, time: str, ratio: str, root: tk.Tk) -> None:
     """
-    Start the Cookie Clicker game with the selected options. Also starts the timer.
+    Start the Cookie Clicker game with the selected options. Also starts the timer and the live statistics.
+
+    The game is played in a separate thread and publishes its progress to an event bus. The Tkinter mainloop drains
+    the bus once a frame and makes all the widget updates itself: it starts the timer when the game is ready, counting
+    down to the same deadline as the game, and reports an aborted game.
 
     :param is_bot_on: Indicates whether the bot is enabled (1 for on, 2 for off).
     :type is_bot_on: int
@@ -30,40 +75,60 @@ def play_game(is_bot_on: int, is_ratio_on: int, time: str, ratio: str, root: tk.
     """
     duration = int(time)  # duration of the game
     ratio = float(ratio)
+    clock = GameClock()
+    events = EventBus()
 
-    # Create and start the timer
+    # Create the timer with the statistics under it, started once the game is ready
     timer_window = tk.Toplevel(root)
     timer = Timer(timer_window)
+    panel = StatsPanel(timer_window)
+    panel.grid(row=1, column=0, sticky="ew")
+    timer_window.geometry(f"{timer.window_width}x{timer.window_height + StatsPanel.HEIGHT}")
 
-    # Function to check when the webpage window is active and start the timer
-    def start_timer_when_webpage_active() -> None:
+    def dispatch_events() -> None:
         """
-        Start the timer when the Cookie Clicker webpage window is active.
-
-        This function continuously checks if the Cookie Clicker webpage window is active and starts the timer if it is.
-        If the webpage window is not active, it retries after a short delay.
+        Handle the events published by the game since the last frame, and check again on the next frame until the
+        game is over.
 
         :return: None
         """
-        webpage_window: List[Win32Window] = gw.getWindowsWithTitle("0 cookies - Cookie Clicker")
-        if webpage_window and webpage_window[0].isActive:  # both conditions are necessary otherwise error occurs
-            timer_thread = threading.Thread(target=timer.count_down, args=(duration,))
-            timer_thread.start()
-        else:
-            root.after(100, start_timer_when_webpage_active)
-
-    # Start checking for webpage activity
-    start_timer_when_webpage_active()
+        for event in events.drain():
+            if event.kind in (ABORTED, FAILED):
+                if event.kind == ABORTED:
+                    messagebox.showinfo("Game Aborted", "The game was aborted because the webpage was closed.")
+                else:
+                    messagebox.showinfo("Game Failed", f"The game stopped because of an error: {event.data['error']}")
+                if timer_window.winfo_exists():
+                    timer_window.destroy()
+                return
+            if event.kind == FINISHED:
+                return
+            if not timer_window.winfo_exists():  # closed by the user, the game goes on
+                continue
+            if event.kind == READY:
+                timer.count_down(clock)
+            elif event.kind == STATS:
+                panel.show_stats(event)
+            elif event.kind == PURCHASE:
+                panel.show_purchase(event)
+        root.after(Timer.FRAME_MS, dispatch_events)
+
+    dispatch_events()
 
     # Start the game in a separate thread
-    game_thread = threading.Thread(target=start_game, args=(is_bot_on, is_ratio_on, duration, ratio, timer_window))
+    game_thread = threading.Thread(target=start_game,
+                                   args=(is_bot_on, is_ratio_on, duration, ratio, events, clock))
     game_thread.start()
 
 
-def start_game(is_bot_on: int, is_ratio_on: int, duration: int, ratio: float, timer_window: tk.Toplevel) -> None:
+def start_game(is_bot_on: int, is_ratio_on: int, duration: int, ratio: float, events: EventBus,
+               clock: GameClock = None) -> None:
     """
     Start the Cookie Clicker game with the chosen mode (Auto-clicking/ Auto-upgrading).
 
+    Runs outside of the Tkinter mainloop, so it never touches a widget: the progress and the end of the game are
+    published to the event bus.
+
     :param is_bot_on: Indicates whether the bot is enabled (1 for on, 2 for off).
     :type is_bot_on: int
     :param is_ratio_on: Indicates whether the ratio option is enabled (1 for on, 2 for off).
@@ -72,26 +137,43 @@ def start_game(is_bot_on: int, is_ratio_on: int, duration: int, ratio: float, ti
     :type duration: int
     :param ratio: The ratio for upgrade buying.
     :type ratio: float
-    :param timer_window: The timer window for displaying the game duration.
-    :type timer_window: tk.Toplevel
+    :param events: Receives the progress of the game, drained by the mainloop.
+    :type events: EventBus
+    :param clock: Started by the bot once the game is ready (default is None).
+    :type clock: GameClock or None
     :return: None
     """
+    from core.bot import CookieClickerBot
+    from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+
+    pool = get_driver_pool()
+    bot = None
     try:
         if is_bot_on == 2 and is_ratio_on == 2:
-            bot = CookieClickerBot(click_enabled=False, ratio_enabled=False)
-            bot.game(duration=duration)
+            bot = CookieClickerBot(click_enabled=False, ratio_enabled=False, pool=pool, events=events)
+            bot.game(duration=duration, clock=clock)
         elif is_bot_on == 2 and is_ratio_on == 1:
-            bot = CookieClickerBot(click_enabled=False, ratio_enabled=True)
-            bot.game(duration=duration, ratio=ratio)
+            bot = CookieClickerBot(click_enabled=False, ratio_enabled=True, pool=pool, events=events)
+            bot.game(duration=duration, ratio=ratio, clock=clock)
         elif is_bot_on == 1 and is_ratio_on == 2:
-            bot = CookieClickerBot(click_enabled=True, ratio_enabled=False)
-            bot.game(duration=duration)
+            bot = CookieClickerBot(click_enabled=True, ratio_enabled=False, pool=pool, events=events)
+            bot.game(duration=duration, clock=clock)
         elif is_bot_on == 1 and is_ratio_on == 1:
-            bot = CookieClickerBot(click_enabled=True, ratio_enabled=True)
-            bot.game(duration=duration, ratio=ratio)
+            bot = CookieClickerBot(click_enabled=True, ratio_enabled=True, pool=pool, events=events)
+            bot.game(duration=duration, ratio=ratio, clock=clock)
     except NoSuchWindowException:  # handles closing the game browser after the game started
-        messagebox.showinfo("Game Aborted", "The game was aborted because the webpage was closed.")
-        timer_window.destroy()
+        if bot is not None:
+            bot.close_driver()  # the pool quits the session if it is broken
+        events.publish(ABORTED)
+    except WebDriverException as error:
+        if bot is not None:
+            bot.close_driver()
+        events.publish(FAILED, error=str(error).splitlines()[0])
+    except Exception as error:  # e.g. the score database is locked: the mainloop must still hear of the end
+        if bot is not None:
+            bot.close_driver()
+        events.publish(FAILED, error=f"{type(error).__name__}: {error}")
+        raise
 
 
 def show_leaderboard(root: tk.Tk) -> None:
@@ -102,45 +184,9 @@ def show_leaderboard(root: tk.Tk) -> None:
     :type root: tk.Tk
     :return: None
     """
-    leaderboard_window = tk.Toplevel(root)
-    leaderboard_window.title("Leaderboard")
-
-    score_manager = GameScoreManager()
-    leaderboard_data = score_manager.get_leaderboard()
-
-    tree = ttk.Treeview(leaderboard_window, columns=('CPS', 'Time', 'Mode'))
-    tree.heading("#1", text="CPS", command=lambda: sort_column(tree, "CPS", False))
-    tree.heading("#2", text="Time", command=lambda: sort_column(tree, "Time", False))
-    tree.heading("#3", text="Mode", command=lambda: sort_column(tree, "Mode", False))
-
-    for index, row in leaderboard_data.iterrows():
-        cps = row['CPS']
-        time = row['Time']
-        mode = row['Mode']
-        tree.insert("", tk.END, values=(cps, time, mode))
-
-    tree.pack()
-
-
-def sort_column(tree: ttk.Treeview, col: str, reverse: bool) -> None:
-    """
-    Sort the leaderboard table by a column.
-
-    :param tree: The Treeview widget containing the leaderboard table.
-    :type tree: ttk.Treeview
-    :param col: The column to sort by.
-    :type col: str
-    :param reverse: Indicates whether to reverse the sorting order.
-    :type reverse: bool
-    :return: None
-    """
-    data = [(tree.set(child, col), child) for child in tree.get_children('')]
-    data.sort(reverse=reverse)
-
-    for index, item in enumerate(data):
-        tree.move(item[1], '', index)
+    from gui.leaderboard import LeaderboardWindow
 
-    tree.heading(col, command=lambda: sort_column(tree, col, not reverse))
+    LeaderboardWindow(root)
 
 
 def show_help(root: tk.Tk) -> None:
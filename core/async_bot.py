@@ -0,0 +1,188 @@
+from core.bot import CookieClickerBot
+from core.game_clock import GameClock
+from core.events import READY
+from core.state import GameState
+import asyncio
+import threading
+import time
+
+
+class AsyncCookieClickerBot(CookieClickerBot):
+    """
+    A CookieClickerBot whose clicking, state polling and purchasing run as independent asyncio coroutines.
+
+    The blocking WebDriver calls run in worker threads, so the clicks never wait behind a state read or a purchase.
+    The coroutines share the latest state snapshot and all stop at the same deadline.
+    """
+    def __init__(self, ratio_enabled: bool, click_enabled: bool, poll_interval: float = 0.05, **kwargs):
+        """
+        Initialize the AsyncCookieClickerBot instance.
+
+        :param ratio_enabled: Indicates whether the bot should use the ratio for upgrades.
+        :type ratio_enabled: bool
+        :param click_enabled: Indicates whether clicking functionality is enabled.
+        :type click_enabled: bool
+        :param poll_interval: Shortest time in seconds between two state reads (default is 0.05).
+        :type poll_interval: float
+        :param kwargs: The other arguments of CookieClickerBot.
+        """
+        super().__init__(ratio_enabled=ratio_enabled, click_enabled=click_enabled, **kwargs)
+        self.poll_interval = poll_interval
+        self.controller = None  # the clicks do not wait for the evaluations, the coroutines run side by side
+        self.latest_state: GameState = None
+        self.latest_state_at: float = 0  # time.monotonic() value when the latest state was requested
+        self.bought_at: float = 0  # time.monotonic() value when the latest purchase ended
+        self.snapshot_lock = threading.Lock()
+
+    def snapshot(self) -> GameState:
+        """
+        Retrieve the game state, one read at a time.
+
+        The poll and telemetry coroutines read the state from worker threads; the state observer applies the changes
+        in order, so that an older drain never overwrites a newer one.
+
+        :return: The parsed game state.
+        :rtype: GameState
+        """
+        with self.snapshot_lock:
+            return super().snapshot()
+
+    def game(self, ratio: float = None, duration: int = 10, save_score: bool = True,
+             clock: GameClock = None) -> float:
+        """
+        Play the game for the specified duration (in seconds), with concurrent click, poll and buy coroutines.
+
+        :param ratio: The ratio that changes the order of upgrades (default is None).
+        :type ratio: float or None
+        :param duration: The duration of the game in seconds (default is 10 seconds).
+        :type duration: int
+        :param save_score: Indicates whether the score is added to the leaderboard (default is True).
+        :type save_score: bool
+        :param clock: Started once the game is ready, e.g. for the Timer (default is None, the bot keeps its own).
+        :type clock: GameClock or None
+        :return: The final cookies per second (CPS).
+        :rtype: float
+        """
+        clock = GameClock() if clock is None else clock
+        first_click_after = asyncio.run(self.play(ratio, duration, clock))
+        return self.end_game(ratio, duration, save_score, first_click_after)
+
+    async def play(self, ratio: float, duration: int, clock: GameClock) -> float:
+        """
+        Run the coroutines of the game until the deadline.
+
+        :param ratio: The ratio that changes the order of upgrades.
+        :type ratio: float or None
+        :param duration: The duration of the game in seconds.
+        :type duration: int
+        :param clock: Started once the game is ready.
+        :type clock: GameClock
+        :return: Seconds from the creation of the bot to the first click.
+        :rtype: float
+        """
+        self.latest_state = await asyncio.to_thread(self.snapshot)  # the webpage is loaded and readable
+        deadline = clock.start(duration)
+        if self.events is not None:
+            self.events.publish(READY, deadline=deadline)
+
+        if self.metrics is not None:
+            self.metrics.start()
+        if self.telemetry is not None:
+            self.telemetry.start()
+        if self.trace is not None:
+            self.trace.start()
+        if self.click_enabled and self.bot_mode == "automated":
+            await asyncio.to_thread(self.clicker.start)
+        first_click_after = time.perf_counter() - self.created_at
+
+        new_state = asyncio.Event()
+        coroutines = [self.click_loop(deadline)]
+        if self.telemetry is not None:
+            coroutines.append(self.telemetry_loop(deadline))
+        if self.ratio_enabled:
+            coroutines += [self.poll_loop(deadline, new_state), self.buy_loop(deadline, ratio, new_state)]
+        await asyncio.gather(*coroutines)
+        return first_click_after
+
+    async def click_loop(self, deadline: float) -> None:
+        """
+        Click the cookie until the deadline. Nothing to do when the clicker clicks from the webpage.
+
+        :param deadline: time.monotonic() value when the game ends.
+        :type deadline: float
+        :return: None
+        """
+        if not self.click_enabled or self.clicker.in_page:
+            return
+        while time.monotonic() < deadline:
+            if self.bot_mode == "automated":
+                await asyncio.to_thread(self.click)
+            else:  # the space bar paused the clicker
+                await asyncio.sleep(self.poll_interval)
+
+    async def telemetry_loop(self, deadline: float) -> None:
+        """
+        Record a telemetry sample at every interval until the deadline.
+
+        :param deadline: time.monotonic() value when the game ends.
+        :type deadline: float
+        :return: None
+        """
+        while time.monotonic() < deadline:
+            await asyncio.to_thread(self.sample)
+            now = time.monotonic()
+            await asyncio.sleep(max(min(self.telemetry.next_sample - now, deadline - now), 0))
+
+    async def poll_loop(self, deadline: float, new_state: asyncio.Event) -> None:
+        """
+        Read the game state until the deadline, as often as the purchase scheduler asks for it.
+
+        :param deadline: time.monotonic() value when the game ends.
+        :type deadline: float
+        :param new_state: Set whenever a new state is published.
+        :type new_state: asyncio.Event
+        :return: None
+        """
+        while time.monotonic() < deadline:
+            requested_at = time.monotonic()
+            self.latest_state = await asyncio.to_thread(self.snapshot)
+            self.latest_state_at = requested_at
+            new_state.set()
+
+            now = time.monotonic()
+            wait = max(self.scheduler.next_check - now, self.poll_interval)
+            await asyncio.sleep(max(min(wait, deadline - now), 0))
+        new_state.set()  # wake the buyer up, so that it sees the deadline
+
+    async def buy_loop(self, deadline: float, ratio: float, new_state: asyncio.Event) -> None:
+        """
+        Buy the next upgrade whenever a new state shows that it is affordable, until the deadline.
+
+        :param deadline: time.monotonic() value when the game ends.
+        :type deadline: float
+        :param ratio: The ratio that changes the order of upgrades.
+        :type ratio: float or None
+        :param new_state: Set whenever a new state is published.
+        :type new_state: asyncio.Event
+        :return: None
+        """
+        while True:
+            await new_state.wait()
+            new_state.clear()
+            if time.monotonic() >= deadline:
+                break
+            if self.latest_state_at < self.bought_at:  # read before the last purchase, the money is out of date
+                continue
+
+            state = self.latest_state
+            next_upgrade = self.ultimate_strategy(ratio, state.upgrade_prices)
+            if self.trace is not None:
+                self.trace.record(time.monotonic(), state, next_upgrade)
+            if state.can_afford(next_upgrade):
+                await asyncio.to_thread(self.upgrade, next_upgrade)
+                self.bought_at = time.monotonic()
+                self.scheduler.replan()
+                if self.telemetry is not None:
+                    await asyncio.to_thread(self.sample, state, next_upgrade)
+            else:
+                self.scheduler.plan(state, state.upgrade_prices[next_upgrade], self.latest_state_at)
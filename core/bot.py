@@ -1,10 +1,19 @@
-from selenium import webdriver
-from selenium.common import StaleElementReferenceException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
+from core import strategy
+from core.clicker import CLICK_ENGINES
+from core.game_clock import GameClock
+from core.elements import ElementCache
+from core.events import EventBus, FINISHED, PURCHASE, READY, STATS
+from core.instrumentation import GameMetrics, save_report
+from core.observer import StateObserver
+from core.pool import DriverPool, create_driver, open_game, page_origin
+from core.replay import TraceRecorder, save_trace
+from core.scheduler import DecisionController, PurchaseScheduler
 from core.score import GameScoreManager
+from core.state import BUILDINGS, GameState, SNAPSHOT_SCRIPT
+from core.telemetry import NO_PURCHASE, Telemetry
 import time
-import keyboard
 from typing import List
 
 
@@ -12,7 +21,12 @@ class CookieClickerBot:
     """
     A bot for automating gameplay in the Cookie Clicker web game using Selenium.
     """
-    def __init__(self, ratio_enabled: bool, click_enabled: bool):
+    MAX_IDLE = 0.1  # longest sleep in seconds of a game loop pass without a click
+
+    def __init__(self, ratio_enabled: bool, click_enabled: bool, click_engine: str = "selenium",
+                 click_rate: float = 100, headless: bool = False, pool: DriverPool = None,
+                 instrument: bool = False, profile: bool = False, telemetry_interval: float = 0.5,
+                 record_trace: bool = True, observe_state: bool = True, events: EventBus = None):
         """
         Initialize the CookieClickerBot instance.
 
@@ -20,17 +34,60 @@ class CookieClickerBot:
         :type ratio_enabled: bool
         :param click_enabled: Indicates whether clicking functionality is enabled.
         :type click_enabled: bool
+        :param click_engine: How the cookie is clicked, "selenium" or "javascript" (default is "selenium").
+        :type click_engine: str
+        :param click_rate: Clicks per second of the "javascript" click engine (default is 100).
+        :type click_rate: float
+        :param headless: Runs the browser without a window and without the space key hook (default is False).
+        :type headless: bool
+        :param pool: Pool of warm browser sessions to play in (default is None, a new browser is launched).
+        :type pool: DriverPool or None
+        :param instrument: Records a latency histogram of every phase of the game loop (default is False).
+        :type instrument: bool
+        :param profile: Also samples the game thread with a profiler, implies instrument (default is False).
+        :type profile: bool
+        :param telemetry_interval: Seconds between two telemetry samples (default is 0.5, None for no telemetry).
+        :type telemetry_interval: float or None
+        :param record_trace: Records every decision of the strategy, for replays (default is True).
+        :type record_trace: bool
+        :param observe_state: Gets state changes from an observer in the webpage, not full reads (default is True).
+        :type observe_state: bool
+        :param events: Receives the progress of the game at every telemetry sample, e.g. for the GUI (default is None).
+        :type events: EventBus or None
         """
+        self.created_at = time.perf_counter()  # to measure the time until the first click
         self.bot_mode: str = "automated"  # Start in automated mode
         self.click_enabled = click_enabled
         self.ratio_enabled = ratio_enabled  # changes ratio use
-        self.chrome_options = webdriver.ChromeOptions()
-        # self.chrome_options.add_argument('--headless')  # no open window
-        # self.chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        self.driver = webdriver.Chrome(options=self.chrome_options)
-        self.driver.get("http://orteil.dashnet.org/experiments/cookie/")
-
-        keyboard.on_press_key("space", self.toggle_bot_mode)  # Hook the space key to toggle bot mode
+        self.headless = headless
+        self.pool = pool
+        if pool is None:
+            self.driver = create_driver(headless)
+            open_game(self.driver)  # from the remote site, or the local server when it is slow
+        else:
+            self.driver = pool.acquire()  # a warm session, reset to a fresh game
+        self.driver_closed = False
+        self.elements = ElementCache(self.driver)  # the cookie and the store entries, looked up once
+        self.observer = StateObserver(self.driver) if observe_state else None
+        self.clicker = CLICK_ENGINES[click_engine](self.driver, self.elements, click_rate)
+        self.scheduler = PurchaseScheduler()  # when to read the state again to buy the next upgrade
+        # how many clicks between two strategy evaluations; an in-page clicker keeps clicking during them anyway
+        self.controller = DecisionController(max_passes=1) if self.clicker.in_page else DecisionController()
+        self.purchases = 0
+        self.iterations = 0  # of the game loop
+        self.telemetry = None if telemetry_interval is None else Telemetry(telemetry_interval)
+        self.trace = TraceRecorder() if record_trace else None
+        self.events = events
+
+        self.metrics = GameMetrics(profile) if instrument or profile else None
+        self.metrics_report = None  # report of the last game, with instrumentation
+        if self.metrics is not None:
+            self.metrics.attach(self)
+
+        if not headless:
+            import keyboard  # not needed, nor always importable, on headless machines
+
+            keyboard.on_press_key("space", self.toggle_bot_mode)  # Hook the space key to toggle bot mode
 
     def click(self) -> None:
         """
@@ -39,8 +96,7 @@ class CookieClickerBot:
         :return: None
         """
         if self.click_enabled:
-            cookie: WebElement = self.driver.find_element(By.CSS_SELECTOR, value="div#cookie")
-            cookie.click()
+            self.clicker.click()
 
     def upgrade(self, upgrade: int) -> None:
         """
@@ -50,17 +106,8 @@ class CookieClickerBot:
         :type upgrade: int
         :return: None
         """
-        upgrades: List[WebElement] = [
-            self.driver.find_element(By.CSS_SELECTOR, value="div#buyCursor"),
-            self.driver.find_element(By.CSS_SELECTOR, value="div#buyGrandma"),
-            self.driver.find_element(By.CSS_SELECTOR, value="div#buyFactory"),
-            self.driver.find_element(By.CSS_SELECTOR, value="div#buyMine"),
-            self.driver.find_element(By.CSS_SELECTOR, value="div#buyShipment"),
-            self.driver.find_element(By.CSS_SELECTOR, value="div[id='buyAlchemy lab']"),
-            self.driver.find_element(By.CSS_SELECTOR, value="div#buyPortal"),
-            self.driver.find_element(By.CSS_SELECTOR, value="div[id='buyTime machine']")
-        ]
-        upgrades[upgrade].click()
+        self.elements.click(BUILDINGS[upgrade])
+        self.purchases += 1
 
     def upgrade_cost(self) -> List[int]:
         """
@@ -90,7 +137,41 @@ class CookieClickerBot:
         money = int(money_tag)
         return money
 
-    def ultimate_strategy(self, ratio: float) -> int:
+    def snapshot(self) -> GameState:
+        """
+        Retrieve money, upgrade costs, building counts and CPS from the webpage in a single round trip.
+
+        With the state observer, only the values that changed since the last snapshot are sent over, already parsed.
+
+        :return: The parsed game state.
+        :rtype: GameState
+        """
+        if self.observer is not None:
+            return self.observer.state()
+        money, prices, counts, cps = self.driver.execute_script(SNAPSHOT_SCRIPT)
+        return GameState.from_page(money, prices, counts, cps)
+
+    def sample(self, state: GameState = None, building: int = NO_PURCHASE) -> None:
+        """
+        Record a telemetry sample of the game, and publish it to the event bus.
+
+        :param state: The game state to record (default is None, a new snapshot is taken).
+        :type state: GameState or None
+        :param building: Index of the building just bought (default is NO_PURCHASE).
+        :type building: int
+        :return: None
+        """
+        if state is None:
+            state = self.snapshot()
+        clicks = self.clicker.clicks()
+        if self.telemetry is not None:
+            self.telemetry.record(time.monotonic(), state.money, state.cps, clicks, building)
+        if self.events is not None:
+            if building != NO_PURCHASE:
+                self.events.publish(PURCHASE, building=BUILDINGS[building])
+            self.events.publish(STATS, money=state.money, cps=state.cps, clicks=clicks, purchases=self.purchases)
+
+    def ultimate_strategy(self, ratio: float, upgrade_prices: List[int] = None) -> int:
         """
         Determine the index of the next upgrade to buy based on a strategy.
 
@@ -98,26 +179,14 @@ class CookieClickerBot:
 
         :param ratio: A ratio that changes the order of upgrades to be bought.
         :type ratio: float
+        :param upgrade_prices: Upgrade costs, e.g. from a snapshot (default is None, the costs are read from the webpage).
+        :type upgrade_prices: list[int] or None
         :return: The index of the next upgrade to buy.
         :rtype: int
         """
-        upgrade_prices: List[int] = self.upgrade_cost()
-
-        """
-        # upgrade value = uv:
-        increase in cps compared to the previous upgrade, e.g. if 'upgrade 1' increases cps by 0.8 and 
-        'upgrade 2' increases cps by 4, the uv[2] = 0.8 * 4 = 5
-        """
-        uv: List[float] = [1, 4, 5, 2.5, 3.5, 7.14, 20, 123.456789]
-
-        for i in range(len(upgrade_prices) - 1):
-            cum: float = 1
-            for j in range(len(upgrade_prices) - 1 - i, 0, -1):
-                cum *= uv[j]
-                if upgrade_prices[j - 1] * cum * ratio <= upgrade_prices[len(upgrade_prices) - 1 - i]:
-                    break
-                return len(upgrade_prices) - 1 - i
-        return 0
+        if upgrade_prices is None:
+            upgrade_prices = self.upgrade_cost()
+        return strategy.ultimate_strategy(upgrade_prices, ratio)
 
     @staticmethod
     def check_money(money: int, next_upgrade_price: int) -> bool:
@@ -162,10 +231,16 @@ class CookieClickerBot:
         """
         if self.bot_mode == "automated":
             self.bot_mode = "manual"
+            if self.clicker.running:
+                self.clicker.stop()
         else:
             self.bot_mode = "automated"
+            if self.click_enabled:
+                self.clicker.start()
+        self.scheduler.replan(reset_income=True)  # the click yield changes with the mode
 
-    def game(self, ratio: float = None, duration: int = 10) -> None:
+    def game(self, ratio: float = None, duration: int = 10, save_score: bool = True,
+             clock: GameClock = None) -> float:
         """
         This method simulates playing the game for the specified duration (in seconds) while
         applying a chosen ratio for upgrading. It automates clicking and upgrading based on
@@ -175,28 +250,151 @@ class CookieClickerBot:
         :type ratio: float or None
         :param duration: The duration of the game in seconds (default is 10 seconds).
         :type duration: int
-        :return: None
+        :param save_score: Indicates whether the score is added to the leaderboard (default is True).
+        :type save_score: bool
+        :param clock: Started once the game is ready, e.g. for the Timer (default is None, the bot keeps its own).
+        :type clock: GameClock or None
+        :return: The final cookies per second (CPS).
+        :rtype: float
         """
-        start_time: float = time.time()
-        end_time = start_time + duration
-
-        while time.time() < end_time:  # for the game duration:
+        clock = GameClock() if clock is None else clock
+        self.snapshot()  # the webpage is loaded and readable: the game is ready
+        end_time = clock.start(duration)
+        if self.events is not None:
+            self.events.publish(READY, deadline=end_time)
+
+        if self.metrics is not None:
+            self.metrics.start()
+        telemetry = self.telemetry
+        if telemetry is not None:
+            telemetry.start()
+        trace = self.trace
+        if trace is not None:
+            trace.start()
+        controller = self.controller
+        controller.start(time.monotonic())
+        if self.click_enabled and self.bot_mode == "automated":
+            self.clicker.start()
+        first_click_after = time.perf_counter() - self.created_at
+
+        iterations = 0
+        while time.monotonic() < end_time:  # for the game duration:
+            iterations += 1
             if self.bot_mode == "automated":  # click if Clicker ON
                 self.click()
-            try:  # handles StaleElementReferenceException, which happens when Clicker off and Ratio ON
-                if self.ratio_enabled:  # buy upgrades if Ration ON
-                    next_upgrade = self.ultimate_strategy(ratio)
-                    if self.check_money(self.money_value(), next_upgrade):
-                        self.upgrade(next_upgrade)
-            except StaleElementReferenceException:
-                pass
+            # buy upgrades if Ration ON, once enough clicks were made since the last evaluation
+            if self.ratio_enabled and controller.due() and self.scheduler.due(time.monotonic()):
+                state = self.snapshot()  # one round trip for money and all the prices
+                next_upgrade = self.ultimate_strategy(ratio, state.upgrade_prices)
+                if trace is not None:
+                    trace.record(time.monotonic(), state, next_upgrade)
+                if state.can_afford(next_upgrade):
+                    self.upgrade(next_upgrade)  # stale store entries are looked up again by the element cache
+                    self.scheduler.replan()
+                    if telemetry is not None:
+                        self.sample(state, next_upgrade)
+                else:  # skip the reads until the upgrade is about to be affordable
+                    self.scheduler.plan(state, state.upgrade_prices[next_upgrade], time.monotonic())
+                controller.update(state.cps, self.scheduler.click_income, time.monotonic())
+            if telemetry is not None and telemetry.due(time.monotonic()):
+                self.sample()
+            if self.bot_mode != "automated" or not self.click_enabled or self.clicker.in_page:
+                self.idle(end_time)  # no click on this pass to pace the loop
+
+        self.iterations = iterations
+        return self.end_game(ratio, duration, save_score, first_click_after)
+
+    def idle(self, end_time: float) -> None:
+        """
+        Sleep until the next state read, telemetry sample or the end of the game, whichever comes first.
+
+        Used on the passes without a click, which would otherwise spin the game loop on a full CPU core. The sleep is
+        capped by MAX_IDLE, so that a toggle of the bot mode takes effect quickly.
+
+        :param end_time: time.monotonic() value when the game ends.
+        :type end_time: float
+        :return: None
+        """
+        now = time.monotonic()
+        wake = min(end_time, now + self.MAX_IDLE)
+        if self.ratio_enabled:
+            wake = min(wake, self.scheduler.next_check)
+        if self.telemetry is not None:
+            wake = min(wake, self.telemetry.next_sample)
+        if wake > now:
+            time.sleep(wake - now)
+
+    def end_game(self, ratio: float, duration: int, save_score: bool, first_click_after: float) -> float:
+        """
+        Stop clicking, save the score and release the browser at the end of a game.
+
+        The telemetry and the decision trace of the game are saved next to its score, and so is the report of the game
+        with instrumentation.
+
+        :param ratio: The ratio that changed the order of upgrades.
+        :type ratio: float or None
+        :param duration: The duration of the game in seconds.
+        :type duration: int
+        :param save_score: Indicates whether the score is added to the leaderboard.
+        :type save_score: bool
+        :param first_click_after: Seconds from the creation of the bot to the first click.
+        :type first_click_after: float
+        :return: The final cookies per second (CPS).
+        :rtype: float
+        """
+        if self.metrics is not None:
+            self.metrics.stop()
+        if self.clicker.running:
+            self.clicker.stop()
+        state = self.snapshot()
+        clicks = self.clicker.clicks()
+        if self.telemetry is not None:  # the final sample
+            self.telemetry.record(time.monotonic(), state.money, state.cps, clicks)
 
         # Maybe move the score handling to app_logic?
-        score_manager = GameScoreManager()  # save the score
-        score_manager.add_score(self.score(), duration, self.click_enabled, self.ratio_enabled, ratio)  # save the score
+        score_id = None
+        if save_score:
+            score_manager = GameScoreManager()  # save the score
+            score_id = score_manager.add_score(state.cps, duration, self.click_enabled, self.ratio_enabled, ratio,
+                                               page=page_origin(self.driver.current_url))
+
+        print(f"Cookies/Second: {state.cps}, Money: {state.money}, Clicks: {clicks}, "
+              f"Clicks/s: {clicks / duration:.1f}, Purchases/s: {self.purchases / duration:.2f}, "
+              f"Element cache: {self.elements.stats()}, Scheduler: {self.scheduler.stats()}, "
+              f"Controller: {None if self.controller is None else self.controller.stats()}, "
+              f"Observer: {None if self.observer is None else self.observer.stats()}, "
+              f"First click after: {first_click_after:.3f} s")
+        if self.metrics is not None:
+            schedule = None if self.controller is None else self.controller.schedule
+            self.metrics_report = self.metrics.report(self.iterations, clicks, self.purchases, first_click_after,
+                                                      schedule)
+            print(f"Metrics: {self.metrics_report}")
+            if score_id is not None:
+                save_report(self.metrics_report, score_id)
+        if self.telemetry is not None and score_id is not None:
+            self.telemetry.save(score_id)
+        if self.trace is not None and self.trace.rows and score_id is not None:
+            save_trace(self.trace.to_trace(ratio, duration, state.cps, clicks / duration), score_id)
+        self.close_driver()
+        if self.events is not None:
+            self.events.publish(FINISHED, cps=state.cps, score_id=score_id)
+        return state.cps
+
+    def close_driver(self) -> None:
+        """
+        Hand the browser session back to the pool, or quit the browser when the bot does not use a pool.
 
-        print(f"Cookies/Second: {self.score()}, Money: {self.money_value()}")
-        self.driver.quit()
+        Only the first call does it, so that an error path may call it again after the end of the game.
+
+        :return: None
+        """
+        if self.driver_closed:
+            return
+        self.driver_closed = True
+        if self.pool is None:
+            self.driver.quit()
+        else:
+            self.pool.release(self.driver)
 
     def __del__(self) -> None:
         """
@@ -207,5 +405,8 @@ class CookieClickerBot:
 
         :return: None
         """
-        keyboard.unhook_all()
+        if not getattr(self, "headless", True):  # the hook is only set for a windowed game
+            import keyboard
+
+            keyboard.unhook_all()
 
@@ -0,0 +1,178 @@
+from selenium.webdriver.remote.webdriver import WebDriver
+from core.elements import ElementCache
+
+
+# Injected autoclicker: a page timer that clicks div#cookie at window.cookieBot.rate clicks per second. Timers
+# fire at most every few milliseconds, so each tick makes up for the clicks owed since the previous one.
+START_SCRIPT = """
+var bot = window.cookieBot = window.cookieBot || {clicks: 0, rate: 0, timer: null};
+bot.rate = arguments[0];
+if (bot.timer === null) {
+    var cookie = document.querySelector('div#cookie');
+    var last = performance.now();
+    var owed = 0;
+    bot.timer = setInterval(function () {
+        var now = performance.now();
+        owed = Math.min(owed + (now - last) * bot.rate / 1000, Math.max(bot.rate, 1));  // at most 1 s of clicks
+        last = now;
+        for (; owed >= 1; owed--) {
+            cookie.click();
+            bot.clicks++;
+        }
+    }, 4);
+}
+"""
+
+RATE_SCRIPT = "if (window.cookieBot) { window.cookieBot.rate = arguments[0]; }"
+
+STOP_SCRIPT = """
+var bot = window.cookieBot;
+if (bot && bot.timer !== null) {
+    clearInterval(bot.timer);
+    bot.timer = null;
+}
+"""
+
+CLICKS_SCRIPT = "return window.cookieBot ? window.cookieBot.clicks : 0;"
+
+
+class SeleniumClicker:
+    """
+    Clicks the cookie with a WebDriver call per click, made by the game loop through click().
+    """
+    in_page = False  # the game loop has to call click()
+
+    def __init__(self, driver: WebDriver, elements: ElementCache, rate: float):
+        """
+        Initialize the SeleniumClicker instance.
+
+        :param driver: The WebDriver of the game.
+        :type driver: WebDriver
+        :param elements: The element cache holding the cookie.
+        :type elements: ElementCache
+        :param rate: Unused, the click rate is bound by the game loop.
+        :type rate: float
+        """
+        self.elements = elements
+        self.running = False
+        self.click_count = 0
+
+    def start(self) -> None:
+        """
+        Start (or resume) clicking.
+
+        :return: None
+        """
+        self.running = True
+
+    def stop(self) -> None:
+        """
+        Stop (or pause) clicking.
+
+        :return: None
+        """
+        self.running = False
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the click rate. The Selenium clicker clicks as fast as the game loop goes.
+
+        :param rate: Clicks per second.
+        :type rate: float
+        :return: None
+        """
+        pass
+
+    def click(self) -> None:
+        """
+        Click the cookie once if the clicker is running.
+
+        :return: None
+        """
+        if self.running:
+            self.elements.click("cookie")
+            self.click_count += 1
+
+    def clicks(self) -> int:
+        """
+        Retrieve the number of clicks made so far.
+
+        :return: Number of clicks.
+        :rtype: int
+        """
+        return self.click_count
+
+
+class JavaScriptClicker:
+    """
+    Clicks the cookie from a script injected into the webpage, at a target rate and without WebDriver round trips.
+    """
+    in_page = True  # the webpage clicks by itself, click() does nothing
+
+    def __init__(self, driver: WebDriver, elements: ElementCache, rate: float):
+        """
+        Initialize the JavaScriptClicker instance.
+
+        :param driver: The WebDriver of the game.
+        :type driver: WebDriver
+        :param elements: Unused, the script finds the cookie itself.
+        :type elements: ElementCache
+        :param rate: Clicks per second.
+        :type rate: float
+        """
+        self.driver = driver
+        self.rate = rate
+        self.running = False
+
+    def start(self) -> None:
+        """
+        Inject the autoclicker (or resume it) at the current rate.
+
+        :return: None
+        """
+        self.driver.execute_script(START_SCRIPT, self.rate)
+        self.running = True
+
+    def stop(self) -> None:
+        """
+        Stop (or pause) the autoclicker. Its click counter is kept.
+
+        :return: None
+        """
+        self.driver.execute_script(STOP_SCRIPT)
+        self.running = False
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the click rate, also while the autoclicker is running.
+
+        :param rate: Clicks per second.
+        :type rate: float
+        :return: None
+        """
+        self.rate = rate
+        self.driver.execute_script(RATE_SCRIPT, rate)
+
+    def click(self) -> None:
+        """
+        Nothing to do, the webpage clicks by itself.
+
+        :return: None
+        """
+        pass
+
+    def clicks(self) -> int:
+        """
+        Retrieve the number of clicks made by the autoclicker so far.
+
+        :return: Number of clicks.
+        :rtype: int
+        """
+        return int(self.driver.execute_script(CLICKS_SCRIPT))
+
+
+# Click engines selectable with the click_engine argument of CookieClickerBot.
+CLICK_ENGINES = {
+    "selenium": SeleniumClicker,
+    "javascript": JavaScriptClicker,
+}
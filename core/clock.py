@@ -1,4 +1,5 @@
 from tkinter import *
+from core.game_clock import GameClock
 import math
 
 
@@ -8,6 +9,7 @@ class Timer:
     """
 
     FONT_NAME = "Courier"
+    FRAME_MS = 16  # refresh period of the display, about one frame
 
     def __init__(self, root: Toplevel):
         """
@@ -44,13 +46,21 @@ class Timer:
         )
         self.canvas.grid(row=0, column=0, padx=0, pady=0)
 
-    def count_down(self, count: int):
+    def count_down(self, clock: GameClock) -> None:
         """
-        Start the countdown timer.
+        Display the time left until the deadline of the game, refreshed every frame, and close the timer at the end.
 
-        :param count: The countdown time in seconds.
-        :type count: int
+        The time left is read from the clock on every frame, so the display never drifts from the game.
+
+        :param clock: The clock of the game, already started.
+        :type clock: GameClock
+        :return: None
         """
+        if not self.root.winfo_exists():  # the window was closed, e.g. the game was aborted
+            return
+
+        remaining = clock.remaining()
+        count = math.ceil(remaining)
         count_min = math.floor(count / 60)
         count_sec = count % 60
 
@@ -58,8 +68,7 @@ class Timer:
             count_sec = f"0{count_sec}"
 
         self.canvas.itemconfig(self.timer_text, text=f"{count_min}:{count_sec}")
-        if count > 0:
-            self.root.after(1000, self.count_down, count - 1)
+        if remaining > 0:
+            self.root.after(self.FRAME_MS, self.count_down, clock)
         else:
             self.root.destroy()
-
@@ -0,0 +1,98 @@
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from core.state import BUILDINGS
+from typing import Dict
+
+
+# CSS selectors of the elements the bot clicks: the cookie and the store entry of every building.
+SELECTORS: Dict[str, str] = {"cookie": "div#cookie"}
+SELECTORS.update({building: f"div[id='buy{building}']" for building in BUILDINGS})
+
+
+class ElementCache:
+    """
+    Caches the webpage elements the bot clicks, so that each of them is looked up only once.
+
+    When a cached element goes stale (the webpage re-rendered it), only that entry is looked up again.
+    """
+    def __init__(self, driver: WebDriver, selectors: Dict[str, str] = None):
+        """
+        Initialize the ElementCache instance.
+
+        :param driver: The WebDriver used to look the elements up.
+        :type driver: WebDriver
+        :param selectors: CSS selectors by element name (default is None, SELECTORS is used).
+        :type selectors: dict[str, str] or None
+        """
+        self.driver = driver
+        self.selectors = SELECTORS if selectors is None else selectors
+        self.elements: Dict[str, WebElement] = {}
+
+        # counters of the lookups saved (hits), made (misses) and repeated because of a stale element (re_resolves)
+        self.hits = 0
+        self.misses = 0
+        self.re_resolves = 0
+
+    def resolve(self, name: str) -> WebElement:
+        """
+        Look an element up on the webpage and store it in the cache.
+
+        :param name: Name of the element, a key of the selectors.
+        :type name: str
+        :return: The element.
+        :rtype: WebElement
+        """
+        element: WebElement = self.driver.find_element(By.CSS_SELECTOR, value=self.selectors[name])
+        self.elements[name] = element
+        return element
+
+    def get(self, name: str) -> WebElement:
+        """
+        Retrieve an element from the cache, looking it up on the first use.
+
+        :param name: Name of the element, a key of the selectors.
+        :type name: str
+        :return: The element.
+        :rtype: WebElement
+        """
+        element = self.elements.get(name)
+        if element is None:
+            self.misses += 1
+            return self.resolve(name)
+        self.hits += 1
+        return element
+
+    def click(self, name: str) -> None:
+        """
+        Click an element, looking it up again once if the cached one went stale.
+
+        :param name: Name of the element, a key of the selectors.
+        :type name: str
+        :return: None
+        """
+        try:
+            self.get(name).click()
+        except StaleElementReferenceException:
+            self.retry_click(name)
+
+    def retry_click(self, name: str) -> None:
+        """
+        Look a stale element up again and click it.
+
+        :param name: Name of the element, a key of the selectors.
+        :type name: str
+        :return: None
+        """
+        self.re_resolves += 1
+        self.resolve(name).click()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieve the cache counters.
+
+        :return: Number of cache hits, misses and re-resolves.
+        :rtype: dict[str, int]
+        """
+        return {"hits": self.hits, "misses": self.misses, "re_resolves": self.re_resolves}
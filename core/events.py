@@ -0,0 +1,75 @@
+from dataclasses import dataclass, field
+import queue
+import time
+from typing import List
+
+# Kinds of the events published by a game.
+READY = "ready"  # the game clock started: deadline
+STATS = "stats"  # a telemetry sample: money, cps, clicks, purchases
+PURCHASE = "purchase"  # an upgrade was bought: building
+FINISHED = "finished"  # the game ended: cps, score_id
+ABORTED = "aborted"  # the webpage was closed during the game
+FAILED = "failed"  # the game stopped on an error: error
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """
+    Something that happened in a game, as published by the bot thread.
+    """
+    kind: str
+    data: dict = field(default_factory=dict)
+    time: float = field(default_factory=time.monotonic)
+
+
+class EventBus:
+    """
+    Hands the events of a game over from the bot thread to the Tkinter mainloop.
+
+    The bot publishes without ever waiting for the GUI; the mainloop drains the queue once a frame and updates its
+    widgets itself, since Tkinter widgets may only be touched from the thread of the mainloop.
+    """
+    def __init__(self, limit: int = 256):
+        """
+        Initialize the EventBus instance, empty.
+
+        :param limit: Most events handed over by one drain, so that a burst can't freeze a frame (default is 256).
+        :type limit: int
+        """
+        self.queue: "queue.SimpleQueue[GameEvent]" = queue.SimpleQueue()
+        self.limit = limit
+        self.published = 0
+        self.dropped = 0  # stats events replaced by a newer one before they were drained
+
+    def publish(self, kind: str, **data) -> None:
+        """
+        Publish an event, from any thread.
+
+        :param kind: The kind of the event, e.g. STATS.
+        :type kind: str
+        :param data: The values of the event.
+        :return: None
+        """
+        self.queue.put(GameEvent(kind, data))
+        self.published += 1
+
+    def drain(self) -> List[GameEvent]:
+        """
+        Take the events published since the last drain, in order. Only the newest STATS event is kept, since the
+        display shows the latest values anyway.
+
+        :return: The events.
+        :rtype: list[GameEvent]
+        """
+        events = []
+        while len(events) < self.limit:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        stats = [index for index, event in enumerate(events) if event.kind == STATS]
+        if len(stats) > 1:
+            dropped = set(stats[:-1])
+            events = [event for index, event in enumerate(events) if index not in dropped]
+            self.dropped += len(dropped)
+        return events
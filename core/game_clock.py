@@ -0,0 +1,35 @@
+import time
+
+
+class GameClock:
+    """
+    The deadline of a game on the monotonic clock, set by the bot once the game is ready to be played.
+
+    The bot loop and the Timer both count down to this one deadline, so the timer ends when the game does.
+    """
+    def __init__(self):
+        """
+        Initialize the GameClock instance. The deadline is not known until start() is called.
+        """
+        self.deadline: float = None
+
+    def start(self, duration: float) -> float:
+        """
+        Start the game clock, once the game is ready.
+
+        :param duration: Duration of the game in seconds.
+        :type duration: float
+        :return: The deadline, a time.monotonic() value.
+        :rtype: float
+        """
+        self.deadline = time.monotonic() + duration
+        return self.deadline
+
+    def remaining(self) -> float:
+        """
+        Retrieve the time left until the deadline.
+
+        :return: Seconds left, 0 once the game is over.
+        :rtype: float
+        """
+        return max(self.deadline - time.monotonic(), 0)
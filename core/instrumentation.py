@@ -0,0 +1,284 @@
+from bisect import bisect_left
+from collections import Counter
+from functools import wraps
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# Upper bounds of the latency buckets in seconds: powers of two from 1 µs to about 8 s.
+BUCKET_BOUNDS: Tuple[float, ...] = tuple(2 ** exponent / 1e6 for exponent in range(24))
+
+# Phases of the game loop that get a latency histogram.
+PHASES = ("click", "snapshot", "upgrade_cost", "money_value", "ultimate_strategy", "upgrade", "stale_retry")
+
+
+class LatencyHistogram:
+    """
+    Counts durations in power-of-two buckets, so that recording one costs a bisect and an increment.
+
+    Percentiles are read as the upper bound of their bucket, i.e. within a factor of two.
+    """
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        """
+        Initialize the LatencyHistogram instance, empty.
+        """
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)  # the last bucket holds everything above the bounds
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Add a duration to the histogram.
+
+        :param seconds: The duration in seconds.
+        :type seconds: float
+        :return: None
+        """
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Retrieve a percentile of the recorded durations.
+
+        :param fraction: The percentile as a fraction, e.g. 0.99.
+        :type fraction: float
+        :return: Upper bound of the bucket of the percentile (at most the max) in seconds, 0 if nothing was recorded.
+        :rtype: float
+        """
+        if self.count == 0:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarize the histogram in milliseconds.
+
+        :return: Count, mean, p50, p90, p99 and max.
+        :rtype: dict[str, float]
+        """
+        mean = self.total / self.count if self.count else 0.0
+        return {"count": self.count, "mean_ms": round(mean * 1e3, 3),
+                "p50_ms": round(self.percentile(0.5) * 1e3, 3), "p90_ms": round(self.percentile(0.9) * 1e3, 3),
+                "p99_ms": round(self.percentile(0.99) * 1e3, 3), "max_ms": round(self.max * 1e3, 3)}
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread at a fixed interval from a background thread.
+
+    The innermost frames are counted, so the report shows where the game thread spends its time, including the time
+    it waits on the browser.
+    """
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialize the SamplingProfiler instance.
+
+        :param interval: Seconds between two samples (default is 0.005).
+        :type interval: float
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.stopped = threading.Event()
+        self.thread: threading.Thread = None
+
+    def start(self, thread_id: int = None) -> None:
+        """
+        Start sampling a thread.
+
+        :param thread_id: Identifier of the sampled thread (default is None, the calling thread).
+        :type thread_id: int or None
+        :return: None
+        """
+        thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, args=(thread_id,), daemon=True)
+        self.thread.start()
+
+    def run(self, thread_id: int) -> None:
+        """
+        Take samples until the profiler is stopped.
+
+        :param thread_id: Identifier of the sampled thread.
+        :type thread_id: int
+        :return: None
+        """
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:  # the thread ended
+                return
+            code = frame.f_code
+            self.samples[f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"] += 1
+            self.sample_count += 1
+
+    def stop(self) -> None:
+        """
+        Stop sampling.
+
+        :return: None
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def top(self, count: int = 10) -> List[Tuple[str, float]]:
+        """
+        Retrieve the locations sampled most often.
+
+        :param count: Number of locations (default is 10).
+        :type count: int
+        :return: (location, share of the samples) pairs, most frequent first.
+        :rtype: list[tuple[str, float]]
+        """
+        total = max(self.sample_count, 1)
+        return [(location, round(samples / total, 3)) for location, samples in self.samples.most_common(count)]
+
+
+class GameMetrics:
+    """
+    Optional instrumentation of a game: a latency histogram per phase of the loop, and a sampling profiler.
+
+    The phases are timed by wrapping the methods of one bot instance, so a bot without metrics runs the plain methods
+    and pays nothing for them.
+    """
+    def __init__(self, profile: bool = False, profile_interval: float = 0.005):
+        """
+        Initialize the GameMetrics instance.
+
+        :param profile: Indicates whether the game thread is sampled by a profiler (default is False).
+        :type profile: bool
+        :param profile_interval: Seconds between two profiler samples (default is 0.005).
+        :type profile_interval: float
+        """
+        self.histograms: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+        self.profiler = SamplingProfiler(profile_interval) if profile else None
+        self.started_at: float = None
+        self.elapsed = 0.0
+
+    def timed(self, phase: str, function: Callable) -> Callable:
+        """
+        Wrap a function so that every call is recorded in the histogram of a phase.
+
+        :param phase: Name of the phase.
+        :type phase: str
+        :param function: The function to time.
+        :type function: Callable
+        :return: The timed function.
+        :rtype: Callable
+        """
+        record = self.histograms[phase].record
+        clock = time.perf_counter
+
+        @wraps(function)
+        def timed_function(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(clock() - start)
+
+        return timed_function
+
+    def attach(self, bot: Any) -> None:
+        """
+        Time the phases of a bot: its methods are replaced by timed ones on this instance only.
+
+        :param bot: The bot, a CookieClickerBot.
+        :type bot: CookieClickerBot
+        :return: None
+        """
+        for phase in ("click", "snapshot", "upgrade_cost", "money_value", "ultimate_strategy", "upgrade"):
+            setattr(bot, phase, self.timed(phase, getattr(bot, phase)))
+        bot.elements.retry_click = self.timed("stale_retry", bot.elements.retry_click)
+
+    def start(self) -> None:
+        """
+        Start measuring the game, and the profiler if there is one, from the calling thread.
+
+        :return: None
+        """
+        self.started_at = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.start()
+
+    def stop(self) -> None:
+        """
+        Stop measuring the game.
+
+        :return: None
+        """
+        if self.started_at is not None:
+            self.elapsed = time.perf_counter() - self.started_at
+        if self.profiler is not None:
+            self.profiler.stop()
+
+    def report(self, iterations: int, clicks: int, purchases: int, first_click_after: float,
+               schedule: List[Tuple[float, int]] = None) -> Dict[str, Any]:
+        """
+        Build the report of the game: the counters, their rates, the phases that ran at least once and the schedule of
+        the strategy evaluations.
+
+        :param iterations: Number of iterations of the game loop.
+        :type iterations: int
+        :param clicks: Number of clicks on the cookie.
+        :type clicks: int
+        :param purchases: Number of upgrades bought.
+        :type purchases: int
+        :param first_click_after: Seconds from the creation of the bot to the first click.
+        :type first_click_after: float
+        :param schedule: (seconds, passes between evaluations) at every change of the controller (default is None).
+        :type schedule: list[tuple[float, int]] or None
+        :return: The report, ready to be serialized as JSON.
+        :rtype: dict[str, Any]
+        """
+        elapsed = max(self.elapsed, 1e-9)
+        report = {
+            "elapsed_s": round(self.elapsed, 3),
+            "first_click_s": round(first_click_after, 3),
+            "counters": {"iterations": iterations, "clicks": clicks, "purchases": purchases},
+            "rates": {"iterations_per_s": round(iterations / elapsed, 1), "clicks_per_s": round(clicks / elapsed, 1),
+                      "purchases_per_s": round(purchases / elapsed, 2)},
+            "phases": {phase: histogram.summary() for phase, histogram in self.histograms.items() if histogram.count},
+        }
+        if schedule is not None:
+            report["schedule"] = schedule
+        if self.profiler is not None:
+            report["profile"] = self.profiler.top()
+        return report
+
+
+def save_report(report: Dict[str, Any], score_id: int, directory: str = "data/reports") -> str:
+    """
+    Write the report of a game next to its score, as data/reports/score-<id>.json.
+
+    :param report: The report of the game.
+    :type report: dict[str, Any]
+    :param score_id: Identifier of the score row of the game.
+    :type score_id: int
+    :param directory: Directory of the reports (default is "data/reports").
+    :type directory: str
+    :return: Path of the report.
+    :rtype: str
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"score-{score_id}.json")
+    with open(path, "w") as file:
+        json.dump(report, file, separators=(",", ":"))
+    return path
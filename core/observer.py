@@ -0,0 +1,159 @@
+from selenium.webdriver.remote.webdriver import WebDriver
+from core.state import BUILDINGS, GameState
+from typing import List
+
+
+# Installs window.cookieObserver: MutationObservers on div#money, div#cps and div#store that parse the changed values
+# in the page and keep the latest value of every changed field in 'pending', until Python drains them. Returns the full
+# parsed state, the starting point the changes apply to. The texts are parsed like GameState.from_page does.
+INSTALL_SCRIPT = """
+var number = function (text) { return Number(text.replace(/,/g, '').trim()) || 0; };
+var read = {
+    money: function () { var e = document.querySelector('div#money'); return e ? number(e.innerText) : 0; },
+    cps: function () {
+        var e = document.querySelector('div#cps');
+        return e ? Number(e.innerText.split(': ')[1]) || 0 : 0;
+    },
+    store: function () {
+        var tags = document.querySelectorAll('div#store b');
+        var prices = [], counts = [];
+        for (var i = 0; i < %(count)d; i++) {
+            var amount = tags[i] ? tags[i].parentNode.querySelector('.amount') : null;
+            prices.push(tags[i] ? number(tags[i].innerText.split('- ')[1] || '') : 0);
+            counts.push(amount ? number(amount.innerText) : 0);
+        }
+        return [prices, counts];
+    }
+};
+var observer = window.cookieObserver;
+if (observer) {
+    observer.observers.forEach(function (o) { o.disconnect(); });
+}
+observer = window.cookieObserver = {pending: {}, changes: 0, observers: [], last: {}};
+var update = function (key, value) {
+    if (observer.last[key] !== value) {
+        observer.last[key] = value;
+        observer.pending[key] = value;
+        observer.changes++;
+    }
+};
+var watch = function (selector, callback) {
+    var element = document.querySelector(selector);
+    if (element) {
+        var o = new MutationObserver(callback);
+        o.observe(element, {childList: true, characterData: true, subtree: true});
+        observer.observers.push(o);
+    }
+};
+var store = read.store();
+observer.last.money = read.money();
+observer.last.cps = read.cps();
+for (var i = 0; i < %(count)d; i++) {
+    observer.last['price' + i] = store[0][i];
+    observer.last['count' + i] = store[1][i];
+}
+watch('div#money', function () { update('money', read.money()); });
+watch('div#cps', function () { update('cps', read.cps()); });
+watch('div#store', function () {
+    var store = read.store();
+    for (var i = 0; i < %(count)d; i++) {
+        update('price' + i, store[0][i]);
+        update('count' + i, store[1][i]);
+    }
+});
+return [observer.last.money, store[0], store[1], observer.last.cps];
+""" % {"count": len(BUILDINGS)}
+
+# Hands the pending changes over and empties the buffer. Returns null when the observer is gone (the page reloaded).
+DRAIN_SCRIPT = """
+var observer = window.cookieObserver;
+if (!observer) { return null; }
+var pending = observer.pending;
+observer.pending = {};
+return pending;
+"""
+
+
+class StateObserver:
+    """
+    Keeps the game state up to date from the changes pushed by an observer installed in the webpage.
+
+    The page parses every change of the money, the CPS and the store as it happens; a drain brings the changed values
+    over in one call, so an unchanged store costs neither a DOM read nor a parse.
+    """
+    def __init__(self, driver: WebDriver):
+        """
+        Initialize the StateObserver instance. The observer is installed on the first drain.
+
+        :param driver: The WebDriver of the game.
+        :type driver: WebDriver
+        """
+        self.driver = driver
+        self.money = 0
+        self.cps = 0.0
+        self.prices: List[int] = [0] * len(BUILDINGS)
+        self.counts: List[int] = [0] * len(BUILDINGS)
+        self.current: GameState = None  # the state built from the values, None when a value changed since
+
+        # number of drains, of changes received and of installs (the first one and after a reload of the webpage)
+        self.drains = 0
+        self.changes = 0
+        self.installs = 0
+
+    def install(self) -> None:
+        """
+        Install the observer in the webpage and read the full state once.
+
+        :return: None
+        """
+        self.money, self.prices, self.counts, self.cps = self.driver.execute_script(INSTALL_SCRIPT)
+        self.current = None
+        self.installs += 1
+
+    def drain(self) -> int:
+        """
+        Apply the changes buffered by the observer since the last drain.
+
+        :return: Number of values that changed.
+        :rtype: int
+        """
+        pending = self.driver.execute_script(DRAIN_SCRIPT)
+        self.drains += 1
+        if pending is None:
+            self.install()
+            return len(BUILDINGS) * 2 + 2
+        for key, value in pending.items():
+            if key == "money":
+                self.money = value
+            elif key == "cps":
+                self.cps = value
+            elif key.startswith("price"):
+                self.prices[int(key[5:])] = value
+            else:
+                self.counts[int(key[5:])] = value
+        if pending:
+            self.current = None
+            self.changes += len(pending)
+        return len(pending)
+
+    def state(self) -> GameState:
+        """
+        Retrieve the current game state, after a drain.
+
+        :return: The game state.
+        :rtype: GameState
+        """
+        self.drain()
+        if self.current is None:
+            self.current = GameState(money=int(self.money), upgrade_prices=tuple(int(price) for price in self.prices),
+                                     building_counts=tuple(int(count) for count in self.counts), cps=float(self.cps))
+        return self.current
+
+    def stats(self) -> dict:
+        """
+        Retrieve the observer counters.
+
+        :return: Number of drains, changes received and installs.
+        :rtype: dict
+        """
+        return {"drains": self.drains, "changes": self.changes, "installs": self.installs}
@@ -0,0 +1,221 @@
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import os
+import re
+import threading
+import urllib.parse
+import urllib.request
+from typing import Dict, List, Set, Union
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Snapshot of the experiment page and its assets, made by cache_page().
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "page_cache")
+
+# Local stand-in of the experiment page for the benchmarks. It runs the economy of the simulator, not the real game,
+# so games played on it are never scored.
+REPLICA_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "replica")
+
+# Relative addresses of assets in the page, its scripts and its styles: src/href attributes, CSS url() and quoted
+# file names.
+ASSET_PATTERN = re.compile(r"""(?:src|href)\s*=\s*["']([^"'#?]+)|url\(\s*["']?([^"')#?]+)|["']([\w./-]+\."""
+                           r"""(?:js|css|png|jpg|jpeg|gif|svg|ico|mp3|ogg|wav|woff2?))["']""")
+
+servers: Dict[str, "PageServer"] = {}  # one running server per directory
+servers_lock = threading.Lock()
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """
+    Serves files without logging every request.
+    """
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class PageServer:
+    """
+    Serves a directory (the page snapshot, or the replica for the benchmarks) from a localhost server in a background
+    thread.
+    """
+    def __init__(self, directory: str):
+        """
+        Initialize the PageServer instance. The server is started by start().
+
+        :param directory: The directory served.
+        :type directory: str
+        """
+        self.directory = directory
+        self.server: ThreadingHTTPServer = None
+
+    def start(self) -> str:
+        """
+        Start serving on a free port.
+
+        :return: Address of the index page.
+        :rtype: str
+        """
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=self.directory))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url
+
+    @property
+    def url(self) -> str:
+        """
+        The address of the index page.
+
+        :return: The address.
+        :rtype: str
+        """
+        return f"http://127.0.0.1:{self.server.server_address[1]}/index.html"
+
+    def stop(self) -> None:
+        """
+        Stop serving.
+
+        :return: None
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def has_snapshot(directory: str = CACHE_DIR) -> bool:
+    """
+    Check if a snapshot of the game page was saved by cache_page().
+
+    :param directory: Where the snapshot is saved (default is CACHE_DIR).
+    :type directory: str
+    :return: True if there is a snapshot, False otherwise.
+    :rtype: bool
+    """
+    return os.path.isfile(os.path.join(directory, "index.html"))
+
+
+def local_url(directory: str = CACHE_DIR) -> str:
+    """
+    Retrieve the address of the local game page, starting its server the first time.
+
+    :param directory: The directory served (default is CACHE_DIR, the page snapshot).
+    :type directory: str
+    :return: Address of the index page.
+    :rtype: str
+    :raises FileNotFoundError: If the directory has no index.html, e.g. no snapshot was saved.
+    """
+    if not has_snapshot(directory):
+        raise FileNotFoundError(f"No game page in {directory}, "
+                                f"save a snapshot with: python -m core.page_server --cache")
+    with servers_lock:
+        server = servers.get(directory)
+        if server is None:
+            server = servers[directory] = PageServer(directory)
+            server.start()
+        return server.url
+
+
+def served_directory(url: str) -> Union[str, None]:
+    """
+    Find the directory a local address is served from.
+
+    :param url: Address of a page.
+    :type url: str
+    :return: The directory, or None if the address is not served by local_url().
+    :rtype: str or None
+    """
+    with servers_lock:
+        for directory, server in servers.items():
+            if url.startswith(server.url.rsplit("/", 1)[0] + "/"):
+                return directory
+    return None
+
+
+def find_assets(content: str) -> Set[str]:
+    """
+    Find the relative addresses of the assets referenced by a page, a script or a style sheet.
+
+    :param content: The text of the file.
+    :type content: str
+    :return: The relative addresses.
+    :rtype: set[str]
+    """
+    assets = set()
+    for match in ASSET_PATTERN.finditer(content):
+        address = next(group for group in match.groups() if group)
+        if not urllib.parse.urlsplit(address).scheme and not address.startswith("//"):  # same site only
+            assets.add(address)
+    return assets
+
+
+def cache_page(url: str, directory: str = CACHE_DIR, timeout: float = 30) -> List[str]:
+    """
+    Save a snapshot of a page and of the assets it references (recursively through its scripts and styles).
+
+    :param url: Address of the page.
+    :type url: str
+    :param directory: Where the snapshot is saved, the page as index.html (default is CACHE_DIR).
+    :type directory: str
+    :param timeout: Seconds allowed for every download (default is 30).
+    :type timeout: float
+    :return: The relative paths saved.
+    :rtype: list[str]
+    """
+    base = url if url.endswith("/") else url.rsplit("/", 1)[0] + "/"
+    queue = [("index.html", url)]
+    seen = {"index.html"}
+    saved = []
+    while queue:
+        path, address = queue.pop()
+        try:
+            with urllib.request.urlopen(address, timeout=timeout) as response:
+                data = response.read()
+        except OSError:  # a missing asset does not prevent the game from loading
+            continue
+        target = os.path.join(directory, *path.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as file:
+            file.write(data)
+        saved.append(path)
+
+        if path.endswith((".html", ".js", ".css")):
+            for asset in find_assets(data.decode("utf-8", errors="replace")):
+                asset_address = urllib.parse.urljoin(address, asset)
+                asset_path = urllib.parse.urlsplit(asset_address).path
+                base_path = urllib.parse.urlsplit(base).path
+                relative = asset_path[len(base_path):]
+                if asset_path.startswith(base_path) and relative and relative not in seen:  # under the page only
+                    seen.add(relative)
+                    queue.append((relative, asset_address))
+    return saved
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Command line entry point: python -m core.page_server --cache
+
+    :param argv: Command line arguments (default is None, sys.argv is used).
+    :type argv: list[str] or None
+    :return: None
+    """
+    from core.pool import GAME_URL
+
+    parser = argparse.ArgumentParser(description="Cache the game page, or serve the cached page locally.")
+    parser.add_argument("--cache", action="store_true", help="save a snapshot of the game page and its assets")
+    parser.add_argument("--url", default=GAME_URL)
+    args = parser.parse_args(argv)
+
+    if args.cache:
+        saved = cache_page(args.url)
+        print(f"Saved {len(saved)} files to {CACHE_DIR}")
+    else:
+        try:
+            url = local_url()
+        except FileNotFoundError as error:
+            parser.error(str(error))
+        print(f"Serving {url} (Ctrl+C to stop)")
+        threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
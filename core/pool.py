@@ -0,0 +1,277 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from core.page_server import CACHE_DIR, has_snapshot, local_url, served_directory
+import os
+import threading
+import urllib.parse
+import time
+from typing import List
+
+
+GAME_URL = "http://orteil.dashnet.org/experiments/cookie/"
+
+# Where the game page is loaded from: "remote" (GAME_URL), "local" (the page snapshot, served from localhost) or
+# "auto" (the remote page, or the snapshot when the remote page is slow or unreachable and a snapshot was saved).
+PAGE_SOURCE = os.environ.get("COOKIE_CLICKER_PAGE", "auto")
+
+# Seconds the remote page is given to load in "auto", and seconds the local page is used after it was too slow.
+REMOTE_TIMEOUT = 10
+REMOTE_RETRY_AFTER = 300
+
+remote_slow_until = 0.0  # time.monotonic() value until which "auto" goes straight to the local page
+
+# Wipes the saved game, so that reloading the webpage starts a fresh one.
+RESET_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+
+def create_driver(headless: bool = False) -> WebDriver:
+    """
+    Launch a Chrome browser for the game.
+
+    :param headless: Runs the browser without a window (default is False).
+    :type headless: bool
+    :return: The WebDriver of the new browser.
+    :rtype: WebDriver
+    """
+    chrome_options = webdriver.ChromeOptions()
+    if headless:
+        chrome_options.add_argument('--headless')  # no open window
+    # chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    return webdriver.Chrome(options=chrome_options)
+
+
+def open_game(driver: WebDriver, source: str = None) -> str:
+    """
+    Load the game page in a browser, from the remote site or the local server as configured.
+
+    :param driver: The WebDriver of the browser.
+    :type driver: WebDriver
+    :param source: "remote", "local" or "auto" (default is None, PAGE_SOURCE).
+    :type source: str or None
+    :return: Address of the page loaded.
+    :rtype: str
+    :raises FileNotFoundError: If the source is "local" and no snapshot of the page was saved.
+    """
+    global remote_slow_until
+    source = PAGE_SOURCE if source is None else source
+    if source == "auto" and not has_snapshot():  # nothing real to fall back to: wait for the remote page
+        source = "remote"
+    if source == "local" or (source == "auto" and time.monotonic() < remote_slow_until):
+        url = local_url()
+        driver.get(url)
+        return url
+    if source == "remote":
+        driver.get(GAME_URL)
+        return GAME_URL
+
+    driver.set_page_load_timeout(REMOTE_TIMEOUT)
+    try:
+        driver.get(GAME_URL)
+        return GAME_URL
+    except WebDriverException:  # too slow (TimeoutException) or unreachable
+        remote_slow_until = time.monotonic() + REMOTE_RETRY_AFTER
+        url = local_url()
+        driver.get(url)
+        return url
+    finally:
+        driver.set_page_load_timeout(300)  # the default of Chrome
+
+
+def page_origin(url: str) -> str:
+    """
+    Classify the address of a game page, to record where a score was played.
+
+    :param url: Address of the page, e.g. driver.current_url.
+    :type url: str
+    :return: "remote" (the site), "snapshot" (the saved page, served locally) or "other" (e.g. the replica).
+    :rtype: str
+    """
+    if urllib.parse.urlsplit(url).hostname == urllib.parse.urlsplit(GAME_URL).hostname:
+        return "remote"
+    if served_directory(url) == CACHE_DIR:
+        return "snapshot"
+    return "other"
+
+
+class DriverPool:
+    """
+    Keeps warm Chrome sessions between games, so that a game does not pay the browser startup.
+
+    A game checks a session out with acquire() and hands it back with release(). Every session handed out is health
+    checked and reset to a fresh game; sessions older than max_age seconds are recycled.
+    """
+    def __init__(self, size: int = 1, max_age: float = 600, headless: bool = False, url: str = None):
+        """
+        Initialize the DriverPool instance. No browser is launched until one is needed or warm() is called.
+
+        :param size: Most idle sessions kept (default is 1).
+        :type size: int
+        :param max_age: Seconds after which a session is quit instead of reused (default is 600).
+        :type max_age: float
+        :param headless: Runs the browsers without a window (default is False).
+        :type headless: bool
+        :param url: Address of the game (default is None, the page is loaded by open_game()).
+        :type url: str or None
+        """
+        self.size = size
+        self.max_age = max_age
+        self.headless = headless
+        self.url = url
+        self.lock = threading.Lock()
+        self.idle: List[WebDriver] = []
+        self.launched_at = {}  # launch time of every session, by id of the driver
+
+        # number of sessions launched, reused and recycled (quit because old or unhealthy)
+        self.launches = 0
+        self.reuses = 0
+        self.recycles = 0
+
+    def launch(self) -> WebDriver:
+        """
+        Launch a new session and open the game.
+
+        :return: The WebDriver of the session.
+        :rtype: WebDriver
+        """
+        driver = create_driver(self.headless)
+        self.open(driver)
+        with self.lock:
+            self.launches += 1
+            self.launched_at[id(driver)] = time.monotonic()
+        return driver
+
+    def warm(self, count: int = None) -> None:
+        """
+        Launch sessions ahead of the games, up to the pool size.
+
+        :param count: Number of sessions to launch (default is None, the pool is filled).
+        :type count: int or None
+        :return: None
+        """
+        count = self.size - len(self.idle) if count is None else count
+        for _ in range(count):
+            self.release(self.launch(), reset=False)
+
+    def is_healthy(self, driver: WebDriver) -> bool:
+        """
+        Check that a session still answers and was not launched more than max_age seconds ago.
+
+        :param driver: The WebDriver of the session.
+        :type driver: WebDriver
+        :return: True if the session can be reused, False otherwise.
+        :rtype: bool
+        """
+        launched_at = self.launched_at.get(id(driver))
+        if launched_at is None or time.monotonic() - launched_at > self.max_age:
+            return False
+        try:
+            return driver.execute_script("return 1;") == 1 and len(driver.window_handles) > 0
+        except WebDriverException:  # the browser was closed or crashed
+            return False
+
+    def reset(self, driver: WebDriver) -> None:
+        """
+        Reset a session to a fresh game: wipe the saved game and reload the webpage.
+
+        :param driver: The WebDriver of the session.
+        :type driver: WebDriver
+        :return: None
+        """
+        driver.execute_script(RESET_SCRIPT)
+        driver.delete_all_cookies()
+        self.open(driver)
+
+    def open(self, driver: WebDriver) -> None:
+        """
+        Load the game page in a session.
+
+        :param driver: The WebDriver of the session.
+        :type driver: WebDriver
+        :return: None
+        """
+        if self.url is None:
+            open_game(driver)
+        else:
+            driver.get(self.url)
+
+    def acquire(self) -> WebDriver:
+        """
+        Check a session out for a game: a healthy idle one reset to a fresh game, or a new one.
+
+        :return: The WebDriver of the session.
+        :rtype: WebDriver
+        """
+        while True:
+            with self.lock:
+                if not self.idle:
+                    break
+                driver = self.idle.pop()
+            if self.is_healthy(driver):
+                try:
+                    self.reset(driver)
+                    with self.lock:
+                        self.reuses += 1
+                    return driver
+                except WebDriverException:
+                    pass
+            self.discard(driver)
+        return self.launch()
+
+    def release(self, driver: WebDriver, reset: bool = False) -> None:
+        """
+        Hand a session back after a game. It is kept if it is healthy and the pool has room, and quit otherwise.
+
+        :param driver: The WebDriver of the session.
+        :type driver: WebDriver
+        :param reset: Reset the session to a fresh game right away (default is False, it is reset on acquire()).
+        :type reset: bool
+        :return: None
+        """
+        if self.is_healthy(driver):
+            try:
+                if reset:
+                    self.reset(driver)
+                with self.lock:
+                    if len(self.idle) < self.size:
+                        self.idle.append(driver)
+                        return
+            except WebDriverException:
+                pass
+        self.discard(driver)
+
+    def discard(self, driver: WebDriver) -> None:
+        """
+        Quit a session that is not reused.
+
+        :param driver: The WebDriver of the session.
+        :type driver: WebDriver
+        :return: None
+        """
+        with self.lock:
+            self.recycles += 1
+            self.launched_at.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:  # already closed
+            pass
+
+    def close(self) -> None:
+        """
+        Quit all the idle sessions.
+
+        :return: None
+        """
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for driver in idle:
+            self.discard(driver)
+
+    def stats(self) -> dict:
+        """
+        Retrieve the pool counters.
+
+        :return: Number of sessions launched, reused and recycled.
+        :rtype: dict
+        """
+        return {"launches": self.launches, "reuses": self.reuses, "recycles": self.recycles}
@@ -0,0 +1,281 @@
+from core import strategy
+from core.simulator import CookieClickerSimulator
+from core.state import BUILDINGS, GameState
+from dataclasses import dataclass, field
+import argparse
+import importlib
+import numpy as np
+import os
+import time
+from typing import Callable, List, Sequence
+
+# A strategy: takes the upgrade prices and the ratio, returns the index of the next upgrade to buy.
+Strategy = Callable[[Sequence[int], float], int]
+
+
+@dataclass
+class DecisionTrace:
+    """
+    The decision points of a real game: the state the strategy saw, and the upgrade it chose, at every evaluation.
+    """
+    ratio: float
+    duration: int
+    final_cps: float
+    clicks_per_second: float
+    time: np.ndarray  # seconds since the start of the game
+    money: np.ndarray
+    cps: np.ndarray
+    prices: np.ndarray  # shape (decisions, 8)
+    chosen: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.chosen)
+
+
+class TraceRecorder:
+    """
+    Records the decision points of a game as the bot plays it.
+    """
+    def __init__(self):
+        """
+        Initialize the TraceRecorder instance, empty.
+        """
+        self.started_at = 0.0
+        self.rows: List[tuple] = []
+
+    def start(self, now: float = None) -> None:
+        """
+        Start the game clock of the trace and forget the decisions of a previous game.
+
+        :param now: time.monotonic() value of the start of the game (default is None, the current time).
+        :type now: float or None
+        :return: None
+        """
+        self.started_at = time.monotonic() if now is None else now
+        self.rows = []
+
+    def record(self, now: float, state: GameState, chosen: int) -> None:
+        """
+        Record a decision point.
+
+        :param now: time.monotonic() value of the decision.
+        :type now: float
+        :param state: The game state the strategy saw.
+        :type state: GameState
+        :param chosen: Index of the upgrade the strategy chose.
+        :type chosen: int
+        :return: None
+        """
+        self.rows.append((now - self.started_at, state.money, state.cps, state.upgrade_prices, chosen))
+
+    def to_trace(self, ratio: float, duration: int, final_cps: float, clicks_per_second: float) -> DecisionTrace:
+        """
+        Build the trace of the game.
+
+        :param ratio: The ratio of the game.
+        :type ratio: float
+        :param duration: Duration of the game in seconds.
+        :type duration: int
+        :param final_cps: The final cookies per second (CPS) of the game.
+        :type final_cps: float
+        :param clicks_per_second: Clicks on the cookie per second over the game.
+        :type clicks_per_second: float
+        :return: The trace.
+        :rtype: DecisionTrace
+        """
+        times, money, cps, prices, chosen = zip(*self.rows) if self.rows else ((), (), (), (), ())
+        return DecisionTrace(ratio, duration, final_cps, clicks_per_second,
+                             time=np.array(times, dtype=np.float32), money=np.array(money, dtype=np.float64),
+                             cps=np.array(cps, dtype=np.float32),
+                             prices=np.array(prices, dtype=np.float64).reshape(-1, len(BUILDINGS)),
+                             chosen=np.array(chosen, dtype=np.int8))
+
+
+def save_trace(trace: DecisionTrace, score_id: int, directory: str = "data/traces") -> str:
+    """
+    Write a trace next to the score of its game, as data/traces/score-<id>.npz.
+
+    :param trace: The trace.
+    :type trace: DecisionTrace
+    :param score_id: Identifier of the score row of the game.
+    :type score_id: int
+    :param directory: Directory of the traces (default is "data/traces").
+    :type directory: str
+    :return: Path of the file.
+    :rtype: str
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"score-{score_id}.npz")
+    np.savez_compressed(path, **vars(trace))
+    return path
+
+
+def load_trace(score_id: int, directory: str = "data/traces") -> DecisionTrace:
+    """
+    Read the trace of a game.
+
+    :param score_id: Identifier of the score row of the game.
+    :type score_id: int
+    :param directory: Directory of the traces (default is "data/traces").
+    :type directory: str
+    :return: The trace.
+    :rtype: DecisionTrace
+    """
+    with np.load(os.path.join(directory, f"score-{score_id}.npz")) as data:
+        return DecisionTrace(ratio=float(data["ratio"]), duration=int(data["duration"]),
+                             final_cps=float(data["final_cps"]), clicks_per_second=float(data["clicks_per_second"]),
+                             time=data["time"], money=data["money"], cps=data["cps"], prices=data["prices"],
+                             chosen=data["chosen"])
+
+
+@dataclass
+class ReplayResult:
+    """
+    The decisions of a candidate strategy on a trace, compared with the recorded ones.
+    """
+    trace: DecisionTrace
+    ratio: float
+    candidate: np.ndarray  # the choice of the candidate at every decision point
+    baseline_cps: float  # simulated CPS of the recorded strategy
+    candidate_cps: float  # simulated CPS of the candidate
+    divergences: np.ndarray = field(init=False)  # indexes of the decision points where the choices differ
+
+    def __post_init__(self):
+        self.divergences = np.flatnonzero(self.candidate != self.trace.chosen)
+
+    @property
+    def divergence_rate(self) -> float:
+        """
+        The share of the decision points where the candidate chose another upgrade.
+
+        :return: A fraction, 0 for an empty trace.
+        :rtype: float
+        """
+        return len(self.divergences) / len(self.trace) if len(self.trace) else 0.0
+
+    @property
+    def projected_cps(self) -> float:
+        """
+        The final CPS the real game would have reached with the candidate: the recorded CPS, scaled by the simulated
+        gain of the candidate over the recorded strategy.
+
+        :return: Cookies per second.
+        :rtype: float
+        """
+        if self.baseline_cps <= 0:
+            return self.trace.final_cps
+        return round(self.trace.final_cps * self.candidate_cps / self.baseline_cps, 1)
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Format the comparison, with the first decision points where the choices differ.
+
+        :param limit: Most divergent decision points listed (default is 10).
+        :type limit: int
+        :return: The report.
+        :rtype: str
+        """
+        lines = [f"{len(self.trace)} decisions, {len(self.divergences)} divergent ({self.divergence_rate:.1%})",
+                 f"Recorded CPS {self.trace.final_cps}, projected {self.projected_cps} "
+                 f"(simulated {self.baseline_cps} -> {self.candidate_cps})"]
+        for index in self.divergences[:limit]:
+            lines.append(f"{self.trace.time[index]:>8.2f} s  money {self.trace.money[index]:>12.0f}  "
+                         f"recorded {self.trace.chosen[index]}  candidate {self.candidate[index]}")
+        return "\n".join(lines)
+
+
+def choices(trace: DecisionTrace, ratio: float, candidate: Strategy = None) -> np.ndarray:
+    """
+    Compute the choice of a strategy at every decision point of a trace.
+
+    :param trace: The trace.
+    :type trace: DecisionTrace
+    :param ratio: The ratio given to the strategy.
+    :type ratio: float
+    :param candidate: The strategy (default is None, ultimate_strategy, evaluated for all the points at once).
+    :type candidate: Strategy or None
+    :return: The indexes of the chosen upgrades.
+    :rtype: np.ndarray
+    """
+    if len(trace) == 0:
+        return np.empty(0, dtype=np.int8)
+    if candidate is None:
+        return strategy.ultimate_strategy_batch(trace.prices, ratio).astype(np.int8)
+    return np.array([candidate(prices.tolist(), ratio) for prices in trace.prices], dtype=np.int8)
+
+
+def simulate(trace: DecisionTrace, ratio: float, candidate: Strategy = None) -> float:
+    """
+    Play the game of a trace again in the simulator, with its duration and click rate.
+
+    :param trace: The trace.
+    :type trace: DecisionTrace
+    :param ratio: The ratio given to the strategy.
+    :type ratio: float
+    :param candidate: The strategy (default is None, ultimate_strategy).
+    :type candidate: Strategy or None
+    :return: The simulated final CPS.
+    :rtype: float
+    """
+    simulator = CookieClickerSimulator(ratio_enabled=True, click_enabled=trace.clicks_per_second > 0,
+                                       clicks_per_second=trace.clicks_per_second, choose_upgrade=candidate)
+    return simulator.game(ratio, trace.duration)
+
+
+def replay(trace: DecisionTrace, ratio: float = None, candidate: Strategy = None) -> ReplayResult:
+    """
+    Feed a trace through a candidate strategy, faster than real time and without a browser.
+
+    The candidate decides on the exact states of the real game, which shows where it diverges. Its CPS impact is
+    projected with the simulator, from the real game's duration and click rate.
+
+    :param trace: The trace.
+    :type trace: DecisionTrace
+    :param ratio: The ratio given to the candidate (default is None, the ratio of the game).
+    :type ratio: float or None
+    :param candidate: The strategy (default is None, ultimate_strategy).
+    :type candidate: Strategy or None
+    :return: The comparison with the recorded decisions.
+    :rtype: ReplayResult
+    """
+    ratio = trace.ratio if ratio is None else ratio
+    return ReplayResult(trace, ratio, choices(trace, ratio, candidate), baseline_cps=simulate(trace, trace.ratio),
+                        candidate_cps=simulate(trace, ratio, candidate))
+
+
+def load_strategy(path: str) -> Strategy:
+    """
+    Import a strategy from its "module:function" path, e.g. "core.strategy:ultimate_strategy".
+
+    :param path: The path of the strategy.
+    :type path: str
+    :return: The strategy.
+    :rtype: Strategy
+    """
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Command line entry point: python -m core.replay --score 12 --ratio 0.4
+
+    :param argv: Command line arguments (default is None, sys.argv is used).
+    :type argv: list[str] or None
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Replay the decisions of recorded games with a candidate strategy.")
+    parser.add_argument("--score", type=int, nargs="+", required=True, help="score ids of the recorded games")
+    parser.add_argument("--ratio", type=float, default=None, help="ratio of the candidate (default: the game's)")
+    parser.add_argument("--strategy", default=None, help="candidate strategy as module:function")
+    parser.add_argument("--directory", default="data/traces")
+    args = parser.parse_args(argv)
+
+    candidate = load_strategy(args.strategy) if args.strategy else None
+    for score_id in args.score:
+        print(f"Score {score_id}:")
+        print(replay(load_trace(score_id, args.directory), args.ratio, candidate).report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+from core.bot import CookieClickerBot
+from core.pool import DriverPool
+from selenium.common.exceptions import WebDriverException
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import product
+from multiprocessing.util import Finalize
+import argparse
+import ctypes
+import os
+import sys
+import time
+from typing import Callable, Iterable, List, Sequence, Union
+
+
+# Memory a headless Chrome game is expected to take, used to cap the number of games played at once.
+MEMORY_PER_GAME = 400 * 1024 ** 2
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """
+    The options of one game, as chosen in the GUI.
+    """
+    click_enabled: bool
+    ratio_enabled: bool
+    duration: int
+    ratio: float = None
+
+
+@dataclass
+class GameResult:
+    """
+    The outcome of one game: its CPS, or the error that ended it.
+    """
+    config: GameConfig
+    cps: float = None
+    error: str = None
+    seconds: float = None  # wall-clock time of the game, browser session included
+
+
+worker_pool: DriverPool = None  # the warm browser of a worker process of a BatchRunner
+
+
+def available_memory() -> Union[int, None]:
+    """
+    Retrieve the physical memory currently available, in bytes.
+
+    :return: The available memory, or None if it can't be read on this platform.
+    :rtype: int or None
+    """
+    if sys.platform == "win32":
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+        return None
+    try:
+        # MemAvailable counts the page cache the kernel can reclaim, unlike SC_AVPHYS_PAGES, which is MemFree
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def max_parallel_games(memory_per_game: int = MEMORY_PER_GAME) -> int:
+    """
+    Compute how many games can be played at once: one per CPU, as long as the available memory allows it.
+
+    :param memory_per_game: Memory taken by one game in bytes (default is MEMORY_PER_GAME).
+    :type memory_per_game: int
+    :return: Number of games.
+    :rtype: int
+    """
+    limit = os.cpu_count() or 1
+    memory = available_memory()
+    if memory is not None:
+        limit = min(limit, memory // memory_per_game)
+    return max(1, limit)
+
+
+def config_matrix(clicker: Sequence[bool] = (True, False), buy_out: Sequence[bool] = (True, False),
+                  ratios: Sequence[float] = (0.5,), durations: Sequence[int] = (60,),
+                  repeats: int = 1) -> List[GameConfig]:
+    """
+    Build the configs of every combination of the options. The ratios only apply to the Buy-Out games.
+
+    :param clicker: Clicker options (default is on and off).
+    :type clicker: Sequence[bool]
+    :param buy_out: Buy-Out options (default is on and off).
+    :type buy_out: Sequence[bool]
+    :param ratios: Ratios of the Buy-Out games (default is 0.5).
+    :type ratios: Sequence[float]
+    :param durations: Game times in seconds (default is 60).
+    :type durations: Sequence[int]
+    :param repeats: Games played with every config (default is 1).
+    :type repeats: int
+    :return: The configs, each one repeated.
+    :rtype: list[GameConfig]
+    """
+    configs = []
+    for click_enabled, ratio_enabled, duration in product(clicker, buy_out, durations):
+        for ratio in (ratios if ratio_enabled else (None,)):
+            configs += [GameConfig(click_enabled, ratio_enabled, duration, ratio)] * repeats
+    return configs
+
+
+def init_worker() -> None:
+    """
+    Start a worker process of a BatchRunner: its browser session is kept warm between its games.
+
+    :return: None
+    """
+    global worker_pool
+    worker_pool = DriverPool(headless=True)
+    Finalize(worker_pool, worker_pool.close, exitpriority=10)  # run when the worker exits, unlike atexit
+
+
+def play_in_worker(config: GameConfig, save_score: bool) -> GameResult:
+    """
+    Play one headless game in a worker process. The score is saved from the worker, with its telemetry and trace.
+
+    Any error ends only this game: it is returned in the result, and the browser session is always handed back.
+
+    :param config: The options of the game.
+    :type config: GameConfig
+    :param save_score: Indicates whether the score is added to the leaderboard.
+    :type save_score: bool
+    :return: The result of the game.
+    :rtype: GameResult
+    """
+    start = time.perf_counter()
+    bot = None
+    try:
+        bot = CookieClickerBot(ratio_enabled=config.ratio_enabled, click_enabled=config.click_enabled, headless=True,
+                               pool=worker_pool)
+        cps = bot.game(ratio=config.ratio, duration=config.duration, save_score=save_score)
+        return GameResult(config, cps=cps, seconds=time.perf_counter() - start)
+    except WebDriverException as error:
+        return GameResult(config, error=str(error).splitlines()[0], seconds=time.perf_counter() - start)
+    except Exception as error:  # e.g. a half-loaded page or a locked database: the batch goes on
+        return GameResult(config, error=f"{type(error).__name__}: {error}", seconds=time.perf_counter() - start)
+    finally:
+        if bot is not None:
+            bot.close_driver()  # the pool quits the session if it is broken, a no-op after end_game()
+
+
+class BatchRunner:
+    """
+    Plays many headless games in parallel and saves each score as soon as its game ends.
+
+    The games are played across a process pool, at most 'workers' at once; the other configs wait in its queue. Every
+    worker keeps its browser session warm between its games and saves its own scores, with their telemetry and trace.
+    """
+    def __init__(self, workers: int = None, save_scores: bool = True):
+        """
+        Initialize the BatchRunner instance.
+
+        :param workers: Number of games played at once (default is None, capped by the CPUs and the memory).
+        :type workers: int or None
+        :param save_scores: Indicates whether the scores are added to the leaderboard (default is True).
+        :type save_scores: bool
+        """
+        self.workers = workers or max_parallel_games()
+        self.save_scores = save_scores
+
+    def run(self, configs: Iterable[GameConfig],
+            on_result: Callable[[GameResult], None] = None) -> List[GameResult]:
+        """
+        Play all the configs, at most 'workers' at once.
+
+        :param configs: The options of the games.
+        :type configs: Iterable[GameConfig]
+        :param on_result: Called with every result as soon as its game ends (default is None).
+        :type on_result: Callable[[GameResult], None] or None
+        :return: The results, in the order the games ended.
+        :rtype: list[GameResult]
+        """
+        results: List[GameResult] = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker) as executor:
+            futures = [executor.submit(play_in_worker, config, self.save_scores) for config in configs]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+        return results
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Command line entry point: python -m core.runner --times 30 60 --ratios 0.25 0.5 0.75
+
+    Plays the headless games of every combination of the options, with no GUI, keyboard hook or window lookup, and
+    prints every result as it comes in with the throughput so far.
+
+    :param argv: Command line arguments (default is None, sys.argv is used).
+    :type argv: list[str] or None
+    :return: None
+    """
+    switch = {"on": True, "off": False}
+    parser = argparse.ArgumentParser(description="Play a matrix of headless games across a process pool.")
+    parser.add_argument("--clicker", nargs="+", choices=switch, default=["on", "off"])
+    parser.add_argument("--buy-out", nargs="+", choices=switch, default=["on", "off"])
+    parser.add_argument("--ratios", nargs="+", type=float, default=[0.5], help="ratios of the Buy-Out games")
+    parser.add_argument("--times", nargs="+", type=int, default=[60], help="game times in seconds")
+    parser.add_argument("--repeats", type=int, default=1, help="games played with every config")
+    parser.add_argument("--processes", type=int, default=None, help="games at once (default: CPUs and memory)")
+    parser.add_argument("--no-save", action="store_true", help="do not add the scores to the leaderboard data")
+    args = parser.parse_args(argv)
+
+    configs = config_matrix([switch[value] for value in args.clicker], [switch[value] for value in args.buy_out],
+                            args.ratios, args.times, args.repeats)
+    start = time.perf_counter()
+    done = []
+
+    def report(result: GameResult) -> None:
+        """
+        Print a result and the throughput so far.
+
+        :param result: The result of a game.
+        :type result: GameResult
+        :return: None
+        """
+        done.append(result)
+        config = result.config
+        minutes = (time.perf_counter() - start) / 60
+        outcome = f"{result.cps} CPS" if result.error is None else f"failed: {result.error}"
+        print(f"[{len(done)}/{len(configs)}] clicker={config.click_enabled} buy_out={config.ratio_enabled} "
+              f"ratio={config.ratio} time={config.duration}: {outcome} ({len(done) / minutes:.1f} games/min)")
+
+    results = BatchRunner(args.processes, not args.no_save).run(configs, report)
+    elapsed = time.perf_counter() - start
+    failures = sum(result.error is not None for result in results)
+    game_seconds = sum(result.seconds for result in results)
+    print(f"{len(results)} games in {elapsed:.1f} s ({len(results) / elapsed * 60:.1f} games/min), "
+          f"{failures} failed, {game_seconds / max(elapsed, 1e-9):.1f} games in parallel on average")
+
+
+if __name__ == "__main__":
+    main()
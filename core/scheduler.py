@@ -0,0 +1,190 @@
+from core.state import GameState
+from typing import List, Tuple, Union
+
+
+class PurchaseScheduler:
+    """
+    Decides when the game loop should read the game state again, instead of polling it on every pass.
+
+    From the price of the next upgrade, the current money and the income (CPS plus the measured click yield) it
+    computes when the upgrade becomes affordable, and skips the strategy and money reads until shortly before then.
+    """
+    def __init__(self, margin: float = 0.05, max_wait: float = 1.0, probe: float = 0.1, smoothing: float = 0.5):
+        """
+        Initialize the PurchaseScheduler instance.
+
+        :param margin: Seconds the state is read before the upgrade is expected to be affordable (default is 0.05).
+        :type margin: float
+        :param max_wait: Longest time in seconds without reading the state (default is 1.0).
+        :type max_wait: float
+        :param probe: Wait in seconds used to measure the click yield when it is not known (default is 0.1).
+        :type probe: float
+        :param smoothing: Weight of the newest click yield measurement in the running estimate (default is 0.5).
+        :type smoothing: float
+        """
+        self.margin = margin
+        self.max_wait = max_wait
+        self.probe = probe
+        self.smoothing = smoothing
+
+        self.next_check: float = 0
+        self.last_money: int = None
+        self.last_time: float = None
+        self.click_income: float = None  # cookies per second made by clicking, None until measured
+
+        # number of passes that read the state (checks) and that skipped reading it (skips)
+        self.checks = 0
+        self.skips = 0
+
+    def due(self, now: float) -> bool:
+        """
+        Check if the game state should be read on this pass through the game loop.
+
+        :param now: Current time.monotonic() value.
+        :type now: float
+        :return: True if the state should be read, False otherwise.
+        :rtype: bool
+        """
+        if now >= self.next_check:
+            self.checks += 1
+            return True
+        self.skips += 1
+        return False
+
+    def replan(self, reset_income: bool = False) -> None:
+        """
+        Read the state again on the next pass, e.g. after buying an upgrade.
+
+        :param reset_income: Forget the measured click yield, e.g. when the bot mode is toggled (default is False).
+        :type reset_income: bool
+        :return: None
+        """
+        self.next_check = 0
+        self.last_money = None
+        self.last_time = None
+        if reset_income:
+            self.click_income = None
+
+    def plan(self, state: GameState, price: int, now: float) -> None:
+        """
+        Schedule the next state read for when the next upgrade is expected to be affordable.
+
+        :param state: The game state just read.
+        :type state: GameState
+        :param price: The cost of the next upgrade.
+        :type price: int
+        :param now: time.monotonic() value when the state was read.
+        :type now: float
+        :return: None
+        """
+        if self.last_time is not None and now > self.last_time:  # no purchase since the last read
+            measured = max((state.money - self.last_money) / (now - self.last_time) - state.cps, 0)
+            if self.click_income is None:
+                self.click_income = measured
+            else:
+                self.click_income += self.smoothing * (measured - self.click_income)
+        self.last_money = state.money
+        self.last_time = now
+
+        if self.click_income is None:  # measure the click yield first
+            wait = self.probe
+        else:
+            income = state.cps + self.click_income
+            wait = self.max_wait if income <= 0 else (price - state.money) / income - self.margin
+        self.next_check = now + min(max(wait, 0), self.max_wait)
+
+    def stats(self) -> dict:
+        """
+        Retrieve the scheduler counters.
+
+        :return: Number of passes that read the state and that skipped it.
+        :rtype: dict
+        """
+        return {"checks": self.checks, "skips": self.skips}
+
+
+class DecisionController:
+    """
+    Adapts how many passes through the game loop (one click each) run between two strategy evaluations.
+
+    Reading the state for an evaluation is a browser round trip during which the bot does not click. While clicks make
+    most of the income (early in the game) the evaluations are spaced out to keep clicking; as the buildings take over
+    the evaluations come back to every pass, so that purchases are not delayed.
+    """
+    def __init__(self, min_passes: int = 1, max_passes: int = 20, smoothing: float = 0.5):
+        """
+        Initialize the DecisionController instance.
+
+        :param min_passes: Fewest passes between two evaluations, when the buildings make all the income (default is 1).
+        :type min_passes: int
+        :param max_passes: Most passes between two evaluations, when the clicks make all the income (default is 20).
+        :type max_passes: int
+        :param smoothing: Weight of the newest click share measurement in the running estimate (default is 0.5).
+        :type smoothing: float
+        """
+        self.min_passes = min_passes
+        self.max_passes = max_passes
+        self.smoothing = smoothing
+
+        self.passes = min_passes  # passes between two evaluations
+        self.countdown = 0  # passes left until the next evaluation
+        self.click_share: float = None  # share of the income made by clicking, None until measured
+        self.started_at: float = 0
+        self.schedule: List[Tuple[float, int]] = []  # (seconds since the start, passes) at every change
+
+    def start(self, now: float) -> None:
+        """
+        Start a game with an evaluation on the first pass.
+
+        :param now: time.monotonic() value of the start of the game.
+        :type now: float
+        :return: None
+        """
+        self.started_at = now
+        self.countdown = 0
+        self.schedule = [(0.0, self.passes)]
+
+    def due(self) -> bool:
+        """
+        Count a pass through the game loop, and check if the strategy may be evaluated on it.
+
+        :return: True if enough passes ran since the last evaluation, False otherwise.
+        :rtype: bool
+        """
+        self.countdown -= 1
+        return self.countdown <= 0
+
+    def update(self, cps: float, click_income: Union[float, None], now: float) -> None:
+        """
+        Record an evaluation, and adapt the passes to the marginal income of the clicks against the buildings.
+
+        :param cps: Cookies per second made by the buildings.
+        :type cps: float
+        :param click_income: Cookies per second made by clicking, e.g. measured by the PurchaseScheduler.
+        :type click_income: float or None
+        :param now: time.monotonic() value of the evaluation.
+        :type now: float
+        :return: None
+        """
+        if click_income is not None:
+            income = cps + click_income
+            share = click_income / income if income > 0 else 0.0
+            if self.click_share is None:
+                self.click_share = share
+            else:
+                self.click_share += self.smoothing * (share - self.click_share)
+            passes = self.min_passes + round((self.max_passes - self.min_passes) * self.click_share)
+            if passes != self.passes:
+                self.passes = passes
+                self.schedule.append((round(now - self.started_at, 3), passes))
+        self.countdown = self.passes
+
+    def stats(self) -> dict:
+        """
+        Retrieve the controller state.
+
+        :return: Current passes between evaluations, click share of the income and number of changes.
+        :rtype: dict
+        """
+        click_share = None if self.click_share is None else round(self.click_share, 3)
+        return {"passes": self.passes, "click_share": click_share, "changes": len(self.schedule) - 1}
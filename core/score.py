@@ -1,43 +1,365 @@
 import pandas as pd
-from typing import Union
+import json
+import math
+import re
+import sqlite3
+from contextlib import closing
+from typing import Dict, Iterable, Tuple, Union
+
+
+TABLE = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    CPS REAL NOT NULL,
+    Time INTEGER NOT NULL,
+    Mode TEXT NOT NULL,
+    Source TEXT NOT NULL DEFAULT 'game',
+    Category TEXT,
+    Ratio REAL,
+    Page TEXT
+);
+"""
+
+# Aggregates of the scores of every (mode, duration, source) group, updated with every score: count, mean and sum of
+# squared deviations (Welford's algorithm), best and worst CPS and a quantile sketch.
+STATS_TABLE = """
+CREATE TABLE IF NOT EXISTS score_stats (
+    Mode TEXT NOT NULL,
+    Time INTEGER NOT NULL,
+    Source TEXT NOT NULL,
+    Category TEXT,
+    Ratio REAL,
+    Count INTEGER NOT NULL,
+    Mean REAL NOT NULL,
+    M2 REAL NOT NULL,
+    Best REAL NOT NULL,
+    Worst REAL NOT NULL,
+    Sketch TEXT NOT NULL,
+    PRIMARY KEY (Mode, Time, Source)
+);
+"""
+
+# Category and Ratio are the typed sort key of Mode; each index keeps one sort order of the leaderboard ready.
+INDEXES = """
+CREATE INDEX IF NOT EXISTS scores_cps ON scores (CPS);
+CREATE INDEX IF NOT EXISTS scores_time ON scores (Time);
+CREATE INDEX IF NOT EXISTS scores_mode ON scores (Mode);
+CREATE INDEX IF NOT EXISTS scores_mode_order ON scores (Category, Ratio);
+"""
+
+# ORDER BY terms of every sortable column.
+SORT_KEYS = {
+    'CPS': ('CPS',),
+    'Time': ('Time',),
+    'Mode': ('Category', 'Ratio'),
+}
+
+MODE_PATTERN = re.compile(r"(?P<category>[^\[]*)(\[(?P<ratio>[^\]]*)\])?")
+
+
+def parse_mode(mode: str) -> Tuple[str, Union[float, None]]:
+    """
+    Split a game mode label into its category and its ratio, e.g. "Buy-Out[0.625]" into ("Buy-Out", 0.625).
+
+    :param mode: The game mode label.
+    :type mode: str
+    :return: The category, and the ratio or None for the modes without one.
+    :rtype: tuple[str, float or None]
+    """
+    match = MODE_PATTERN.match(mode)
+    try:
+        ratio = float(match.group('ratio'))
+    except (TypeError, ValueError):  # no ratio, or e.g. "Buy-Out[None]"
+        ratio = None
+    return match.group('category'), ratio
+
+
+class QuantileSketch:
+    """
+    A streaming quantile sketch: counts of the values in logarithmic buckets, each one ACCURACY wide in relative terms.
+
+    Any quantile is within ACCURACY of the true value (relatively), and the size only grows with the range of the
+    values, not with their number.
+    """
+    ACCURACY = 0.01
+    GAMMA = (1 + ACCURACY) / (1 - ACCURACY)
+
+    def __init__(self, buckets: Dict[int, int] = None, zeros: int = 0):
+        """
+        Initialize the QuantileSketch instance.
+
+        :param buckets: Number of values by bucket index (default is None, empty).
+        :type buckets: dict[int, int] or None
+        :param zeros: Number of values equal to 0, which have no logarithm (default is 0).
+        :type zeros: int
+        """
+        self.buckets = {} if buckets is None else buckets
+        self.zeros = zeros
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the sketch.
+
+        :param value: The value, 0 or more.
+        :type value: float
+        :return: None
+        """
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value, self.GAMMA))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, fraction: float) -> Union[float, None]:
+        """
+        Retrieve an approximate quantile, by nearest rank: the smallest value with at least that fraction of the
+        values at or below it.
+
+        :param fraction: The quantile as a fraction, e.g. 0.5 for the median.
+        :type fraction: float
+        :return: The quantile, or None if the sketch is empty.
+        :rtype: float or None
+        """
+        count = self.zeros + sum(self.buckets.values())
+        if count == 0:
+            return None
+        rank = max(math.ceil(round(fraction * count, 9)), 1)  # rounded so that e.g. 0.9 * 10 is rank 9, not 10
+        seen = self.zeros
+        if rank <= seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank <= seen:
+                return 2 * self.GAMMA ** index / (self.GAMMA + 1)  # the middle of the bucket, in relative terms
+        return 2 * self.GAMMA ** max(self.buckets) / (self.GAMMA + 1)
+
+    def to_json(self) -> str:
+        """
+        Serialize the sketch for the database.
+
+        :return: The sketch as JSON.
+        :rtype: str
+        """
+        return json.dumps({"zeros": self.zeros, "buckets": self.buckets}, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "QuantileSketch":
+        """
+        Read a sketch serialized by to_json().
+
+        :param text: The sketch as JSON.
+        :type text: str
+        :return: The sketch.
+        :rtype: QuantileSketch
+        """
+        data = json.loads(text)
+        return cls({int(index): count for index, count in data["buckets"].items()}, data["zeros"])
 
 
 class GameScoreManager:
     """
-    Manages game scores, stores them in a CSV file, and provides methods to interact with the data.
+    Manages game scores, stores them in a SQLite database, and provides methods to interact with the data.
+
+    Scores are appended with a single INSERT, and the database runs in WAL mode, so several games (threads or
+    processes) can save their scores at the same time.
     """
-    def __init__(self):
+    def __init__(self, file_path: str = "data/score.db", csv_path: str = "data/score.csv"):
         """
         Initialize the GameScoreManager instance.
 
-        The data is loaded from an existing CSV file or an empty DataFrame is created if the file doesn't exist.
+        The database is created if it doesn't exist. The scores of the former CSV file are imported into it once.
+
+        :param file_path: Path of the SQLite database (default is "data/score.db").
+        :type file_path: str
+        :param csv_path: Path of the CSV file the scores used to be stored in (default is "data/score.csv").
+        :type csv_path: str
         """
-        self.file_path = "data/score.csv"
-        self.load_data()
+        self.file_path = file_path
+        self.csv_path = csv_path
+        with closing(self.connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(TABLE)
+            connection.executescript(STATS_TABLE)
+            self.import_csv(connection)
+            self.add_sort_keys(connection)
+            self.add_stats(connection)
+            self.add_page(connection)
+            self.add_worst(connection)
+            connection.executescript(INDEXES)
 
-    def load_data(self) -> None:
+    def connect(self) -> sqlite3.Connection:
         """
-        Load game score data from a CSV file.
+        Open a connection to the database. Each operation uses its own, so that instances can be shared by threads.
 
-        If the file doesn't exist, an empty DataFrame is created.
+        :return: The connection.
+        :rtype: sqlite3.Connection
+        """
+        connection = sqlite3.connect(self.file_path, timeout=30)
+        connection.execute("PRAGMA synchronous=NORMAL")  # safe in WAL mode, and no sync on every commit
+        return connection
+
+    def import_csv(self, connection: sqlite3.Connection) -> None:
+        """
+        Import the scores of the former CSV file, the first time the database is opened.
 
+        The database user_version is set to 1 once the import is done, so the file is never imported twice.
+
+        :param connection: An open connection to the database.
+        :type connection: sqlite3.Connection
         :return: None
         """
-        try:
-            self.data = pd.read_csv(self.file_path)
-        except FileNotFoundError:
-            # Create an empty DataFrame if the file doesn't exist
-            self.data = pd.DataFrame(columns=['CPS', 'Time', 'Mode'])
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")  # another process opening the database waits for the import
+            if connection.execute("PRAGMA user_version").fetchone()[0] >= 1:
+                return
+            try:
+                data = pd.read_csv(self.csv_path)
+            except FileNotFoundError:
+                data = pd.DataFrame(columns=['CPS', 'Time', 'Mode'])
+            if 'Source' not in data.columns:  # scores saved before sweeps existed all come from played games
+                data['Source'] = "game"
+            rows = data[['CPS', 'Time', 'Mode', 'Source']].itertuples(index=False, name=None)
+            self.insert(connection, [(float(cps), int(time), mode, source) for cps, time, mode, source in rows])
+            connection.execute("PRAGMA user_version = 1")
 
-    def save_data(self) -> None:
+    @staticmethod
+    def add_sort_keys(connection: sqlite3.Connection) -> None:
         """
-        Save the current game score data to a CSV file.
+        Add the Category and Ratio sort keys to a database created before they existed, and fill them in.
 
+        :param connection: An open connection to the database.
+        :type connection: sqlite3.Connection
         :return: None
         """
-        self.data.to_csv(self.file_path, index=False)
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if connection.execute("PRAGMA user_version").fetchone()[0] >= 2:
+                return
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(scores)")]
+            if 'Category' not in columns:
+                connection.execute("ALTER TABLE scores ADD COLUMN Category TEXT")
+                connection.execute("ALTER TABLE scores ADD COLUMN Ratio REAL")
+            modes = [row[0] for row in connection.execute("SELECT DISTINCT Mode FROM scores WHERE Category IS NULL")]
+            connection.executemany("UPDATE scores SET Category = ?, Ratio = ? WHERE Mode = ?",
+                                   [(*parse_mode(mode), mode) for mode in modes])
+            connection.execute("PRAGMA user_version = 2")
 
-    def add_score(self, cps: float, time: int, click: bool, buy_out: bool, ratio: Union[str, None] = None) -> None:
+    @classmethod
+    def add_stats(cls, connection: sqlite3.Connection) -> None:
+        """
+        Compute the aggregates of the scores saved before they existed, once.
+
+        :param connection: An open connection to the database.
+        :type connection: sqlite3.Connection
+        :return: None
+        """
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if connection.execute("PRAGMA user_version").fetchone()[0] >= 3:
+                return
+            connection.execute("DELETE FROM score_stats")
+            for cps, time, mode, source in connection.execute("SELECT CPS, Time, Mode, Source FROM scores ORDER BY id"):
+                cls.update_stats(connection, cps, time, mode, source)
+            connection.execute("PRAGMA user_version = 3")
+
+    @staticmethod
+    def add_page(connection: sqlite3.Connection) -> None:
+        """
+        Add the Page column to a database created before it existed. The page of the older scores stays unknown (NULL).
+
+        :param connection: An open connection to the database.
+        :type connection: sqlite3.Connection
+        :return: None
+        """
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if connection.execute("PRAGMA user_version").fetchone()[0] >= 4:
+                return
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(scores)")]
+            if 'Page' not in columns:
+                connection.execute("ALTER TABLE scores ADD COLUMN Page TEXT")
+            connection.execute("PRAGMA user_version = 4")
+
+    @staticmethod
+    def add_worst(connection: sqlite3.Connection) -> None:
+        """
+        Add the worst CPS to the aggregates of a database created before it existed, and fill it in from the scores.
+
+        :param connection: An open connection to the database.
+        :type connection: sqlite3.Connection
+        :return: None
+        """
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if connection.execute("PRAGMA user_version").fetchone()[0] >= 5:
+                return
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(score_stats)")]
+            if 'Worst' not in columns:
+                connection.execute("ALTER TABLE score_stats ADD COLUMN Worst REAL")
+                connection.execute("UPDATE score_stats SET Worst = (SELECT MIN(CPS) FROM scores WHERE scores.Mode = "
+                                   "score_stats.Mode AND scores.Time = score_stats.Time AND "
+                                   "scores.Source = score_stats.Source)")
+            connection.execute("PRAGMA user_version = 5")
+
+    @staticmethod
+    def update_stats(connection: sqlite3.Connection, cps: float, time: int, mode: str, source: str) -> None:
+        """
+        Add a score to the aggregates of its group, in constant time.
+
+        Must be called in the transaction that inserts the score, started with BEGIN IMMEDIATE so that no other
+        process updates the same group in between.
+
+        :param connection: An open connection to the database.
+        :type connection: sqlite3.Connection
+        :param cps: Cookies per second value.
+        :type cps: float
+        :param time: Time in seconds.
+        :type time: int
+        :param mode: The game mode label, e.g. "Buy-Out[0.5]".
+        :type mode: str
+        :param source: Where the score comes from.
+        :type source: str
+        :return: None
+        """
+        row = connection.execute("SELECT Count, Mean, M2, Best, Worst, Sketch FROM score_stats "
+                                 "WHERE Mode = ? AND Time = ? AND Source = ?", (mode, time, source)).fetchone()
+        if row is None:
+            count, mean, m2, best, worst, sketch = 0, 0.0, 0.0, cps, cps, QuantileSketch()
+        else:
+            count, mean, m2, best, worst = row[:5]
+            sketch = QuantileSketch.from_json(row[5])
+        count += 1
+        delta = cps - mean
+        mean += delta / count
+        m2 += delta * (cps - mean)
+        sketch.add(cps)
+        connection.execute("INSERT OR REPLACE INTO score_stats (Mode, Time, Source, Category, Ratio, Count, Mean, M2, "
+                           "Best, Worst, Sketch) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                           (mode, time, source, *parse_mode(mode), count, mean, m2, max(best, cps), min(worst, cps),
+                            sketch.to_json()))
+
+    @staticmethod
+    def insert(connection: sqlite3.Connection, rows: Iterable[Tuple[float, int, str, str]], page: str = None) -> int:
+        """
+        Insert scores with the sort keys of their game mode.
+
+        :param connection: An open connection to the database.
+        :type connection: sqlite3.Connection
+        :param rows: (CPS, Time, Mode, Source) rows.
+        :type rows: Iterable[tuple[float, int, str, str]]
+        :param page: Where the game page of the scores was loaded from (default is None, unknown).
+        :type page: str or None
+        :return: Identifier of the last row inserted.
+        :rtype: int
+        """
+        connection.executemany(
+            "INSERT INTO scores (CPS, Time, Mode, Source, Category, Ratio, Page) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(cps, time, mode, source, *parse_mode(mode), page) for cps, time, mode, source in rows]
+        )
+        return connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+    def add_score(self, cps: float, time: int, click: bool, buy_out: bool, ratio: Union[str, None] = None,
+                  source: str = "game", page: str = None) -> int:
         """
         Add a new game score to the data.
 
@@ -53,7 +375,12 @@ class GameScoreManager:
         :type buy_out: bool
         :param ratio: Game mode (e.g., "manual" or "automated").
         :type ratio: str, None
-        :return: None
+        :param source: Where the score comes from, "game" for a played game or e.g. "sweep-simulated" for a sweep run.
+        :type source: str
+        :param page: Where the game page was loaded from, e.g. "remote" or "snapshot" (default is None, unknown).
+        :type page: str or None
+        :return: Identifier of the score row, e.g. to link the report of the game to it.
+        :rtype: int
         """
         if click and buy_out:
             mode = f"Full-Auto[{ratio}]"
@@ -64,17 +391,104 @@ class GameScoreManager:
         else:
             mode = "Manual"
 
-        new_row = {'CPS': cps, 'Time': time, 'Mode': mode}
-        self.data = pd.concat([self.data, pd.DataFrame([new_row])], ignore_index=True)
-        self.save_data()
+        with closing(self.connect()) as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            score_id = self.insert(connection, [(cps, time, mode, source)], page)
+            self.update_stats(connection, cps, time, mode, source)
+            return score_id
 
-    def get_leaderboard(self) -> pd.DataFrame:
+    def get_leaderboard(self, include_sweeps: bool = False, limit: int = None, offset: int = 0,
+                        sort_by: str = "CPS", descending: bool = True, top: int = None) -> pd.DataFrame:
         """
-        Retrieve the leaderboard sorted by Cookies per Second (CPS) in descending order.
+        Retrieve the leaderboard sorted by Cookies per Second (CPS) in descending order, or by another column.
+
+        CPS and Time sort as numbers, Mode by category and then by ratio. Every sort order has an index, so only the
+        requested rows are read and a page of the leaderboard costs the same however many scores there are.
 
+        :param include_sweeps: Indicates whether the scores of sweep runs are included (default is False).
+        :type include_sweeps: bool
+        :param limit: Number of scores retrieved (default is None, all of them).
+        :type limit: int or None
+        :param offset: Number of scores skipped before the first one retrieved (default is 0).
+        :type offset: int
+        :param sort_by: Column to sort by: "CPS", "Time" or "Mode" (default is "CPS").
+        :type sort_by: str
+        :param descending: Indicates whether the order is descending (default is True).
+        :type descending: bool
+        :param top: Only the 'top' best scores by CPS are sorted and listed (default is None, all the scores).
+        :type top: int or None
         :return: Leaderboard DataFrame.
         :rtype: pd.DataFrame
         """
-        leaderboard = self.data.sort_values(by='CPS', ascending=False)
-        return leaderboard
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Can't sort the leaderboard by {sort_by!r}")
+        where = "" if include_sweeps else "WHERE Source = 'game'"
+        order = "DESC" if descending else "ASC"
+        order_by = ", ".join(f"{key} {order}" for key in (*SORT_KEYS[sort_by], 'id'))
+        scores = "scores"
+        if top is not None:  # the best scores, e.g. sorted by time among themselves
+            scores = (f"(SELECT id, CPS, Time, Mode, Source, Category, Ratio FROM scores {where} "
+                      f"ORDER BY CPS DESC, id DESC LIMIT {int(top)})")
+            where = ""
+        query = f"SELECT CPS, Time, Mode, Source FROM {scores} {where} ORDER BY {order_by} LIMIT ? OFFSET ?"
+        with closing(self.connect()) as connection:
+            return pd.read_sql_query(query, connection, params=(-1 if limit is None else limit, offset))
+
+    def get_stats(self, include_sweeps: bool = False) -> pd.DataFrame:
+        """
+        Retrieve the summary of the scores by game mode (with its ratio) and game time.
 
+        The summary is read from the aggregates kept up to date by add_score(), so it costs one row per group however
+        many games were played. The median and P90 of the sketch are within 1% of the exact ones, and never beyond the
+        best or worst score of the group.
+
+        :param include_sweeps: Indicates whether the scores of sweep runs are included (default is False).
+        :type include_sweeps: bool
+        :return: Mode, Time, Games, Mean, Std, Best, Median and P90 of every group, by mode and then by time.
+        :rtype: pd.DataFrame
+        """
+        where = "" if include_sweeps else "WHERE Source = 'game'"
+        query = (f"SELECT Mode, Time, Count, Mean, M2, Best, Worst, Sketch FROM score_stats {where} "
+                 f"ORDER BY Category, Ratio, Time")
+        with closing(self.connect()) as connection:
+            rows = connection.execute(query).fetchall()
+
+        groups: Dict[Tuple[str, int], list] = {}  # the sources of a group are merged, e.g. games and sweeps
+        for mode, time, count, mean, m2, best, worst, sketch in rows:
+            sketch = QuantileSketch.from_json(sketch)
+            group = groups.get((mode, time))
+            if group is None:
+                groups[(mode, time)] = [count, mean, m2, best, worst, sketch]
+                continue
+            total = group[0] + count
+            delta = mean - group[1]
+            group[2] += m2 + delta ** 2 * group[0] * count / total  # parallel variant of Welford's algorithm
+            group[1] += delta * count / total
+            group[0] = total
+            group[3] = max(group[3], best)
+            group[4] = min(group[4], worst)
+            for index, bucket_count in sketch.buckets.items():
+                group[5].buckets[index] = group[5].buckets.get(index, 0) + bucket_count
+            group[5].zeros += sketch.zeros
+
+        def quantile(sketch: QuantileSketch, fraction: float, worst: float, best: float) -> float:
+            # the sketch returns the middle of a bucket, which can lie past the scores at the ends of the group
+            return round(min(max(sketch.quantile(fraction), worst), best), 1)
+
+        summary = [(mode, time, count, round(mean, 1), round(math.sqrt(m2 / (count - 1)), 1) if count > 1 else 0.0,
+                    round(best, 1), quantile(sketch, 0.5, worst, best), quantile(sketch, 0.9, worst, best))
+                   for (mode, time), (count, mean, m2, best, worst, sketch) in groups.items()]
+        return pd.DataFrame(summary, columns=['Mode', 'Time', 'Games', 'Mean', 'Std', 'Best', 'Median', 'P90'])
+
+    def count_scores(self, include_sweeps: bool = False) -> int:
+        """
+        Retrieve the number of scores in the leaderboard.
+
+        :param include_sweeps: Indicates whether the scores of sweep runs are counted (default is False).
+        :type include_sweeps: bool
+        :return: Number of scores.
+        :rtype: int
+        """
+        where = "" if include_sweeps else "WHERE Source = 'game'"
+        with closing(self.connect()) as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM scores {where}").fetchone()[0]
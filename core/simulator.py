@@ -0,0 +1,219 @@
+from core import strategy
+from core.state import BUILDINGS, GameState
+from itertools import accumulate
+import math
+import operator
+from typing import Callable, List, Sequence, Tuple
+
+
+# Starting prices of the buildings, in the store order of the webpage.
+BASE_COSTS: Tuple[int, ...] = (15, 100, 500, 2000, 7000, 50000, 1000000, 123456789)
+
+# Price multiplier applied to a building every time it is bought.
+COST_GROWTH = 1.1
+
+# Cookies per second of one building: a Cursor makes 0.2 CPS and each next building is worth the upgrade value times
+# the previous one, which is the model the strategy is built on.
+BUILDING_CPS: Tuple[float, ...] = tuple(accumulate(strategy.UPGRADE_VALUES, operator.mul, initial=0.2))[1:]
+
+# Cookies made by one click on the cookie.
+CLICK_YIELD = 1
+
+
+class CookieClickerSimulator:
+    """
+    A headless model of the Cookie Clicker economy, played in simulated time.
+
+    Exposes the same surface as CookieClickerBot (upgrade_cost, money_value, score, upgrade, click, ultimate_strategy
+    and game), so a strategy can be evaluated in milliseconds instead of a real-time browser game.
+    """
+    def __init__(self, ratio_enabled: bool, click_enabled: bool, clicks_per_second: float = 100,
+                 tick: float = 0.01, choose_upgrade: Callable[[Sequence[int], float], int] = None):
+        """
+        Initialize the CookieClickerSimulator instance with a fresh game.
+
+        :param ratio_enabled: Indicates whether the bot should use the ratio for upgrades.
+        :type ratio_enabled: bool
+        :param click_enabled: Indicates whether clicking functionality is enabled.
+        :type click_enabled: bool
+        :param clicks_per_second: Clicks made by the clicker every second (default is 100).
+        :type clicks_per_second: float
+        :param tick: Simulated seconds of one pass through the game loop (default is 0.01).
+        :type tick: float
+        :param choose_upgrade: Candidate strategy, called like strategy.ultimate_strategy (default is None, that one).
+        :type choose_upgrade: Callable[[Sequence[int], float], int] or None
+        """
+        self.bot_mode: str = "automated"
+        self.ratio_enabled = ratio_enabled
+        self.click_enabled = click_enabled
+        self.clicks_per_second = clicks_per_second
+        self.tick = tick
+        self.choose_upgrade = strategy.ultimate_strategy if choose_upgrade is None else choose_upgrade
+
+        self.time: float = 0
+        self.money: float = 0
+        self.cps: float = 0
+        self.clicks: float = 0
+        self.prices: List[int] = list(BASE_COSTS)
+        self.counts: List[int] = [0] * len(BUILDINGS)
+
+    def click(self) -> None:
+        """
+        Click on the cookie once if click functionality is enabled.
+
+        :return: None
+        """
+        if self.click_enabled:
+            self.money += CLICK_YIELD
+            self.clicks += 1
+
+    def upgrade(self, upgrade: int) -> None:
+        """
+        Buy a building, if there is enough money for it.
+
+        :param upgrade: Index of the upgrade to be bought.
+        :type upgrade: int
+        :return: None
+        """
+        price = self.prices[upgrade]
+        if self.money >= price:
+            self.money -= price
+            self.cps += BUILDING_CPS[upgrade]
+            self.counts[upgrade] += 1
+            self.prices[upgrade] = math.ceil(price * COST_GROWTH)
+
+    def upgrade_cost(self) -> List[int]:
+        """
+        Retrieve the list of costs for all the upgrades.
+
+        :return: A list of integers representing the upgrade costs.
+        :rtype: list[int]
+        """
+        return list(self.prices)
+
+    def money_value(self) -> int:
+        """
+        Retrieve the current money value, as the webpage displays it.
+
+        :return: The current money value as an integer.
+        :rtype: int
+        """
+        return int(self.money)
+
+    def score(self) -> float:
+        """
+        Retrieve the cookies per second (CPS) value, as the webpage displays it.
+
+        :return: The CPS value as a floating-point number.
+        :rtype: float
+        """
+        return round(self.cps, 1)
+
+    def snapshot(self) -> GameState:
+        """
+        Retrieve money, upgrade costs, building counts and CPS at once.
+
+        :return: The game state.
+        :rtype: GameState
+        """
+        return GameState(self.money_value(), tuple(self.prices), tuple(self.counts), self.score())
+
+    def ultimate_strategy(self, ratio: float, upgrade_prices: List[int] = None) -> int:
+        """
+        Determine the index of the next upgrade to buy, with the strategy of CookieClickerBot (or the one given).
+
+        :param ratio: A ratio that changes the order of upgrades to be bought.
+        :type ratio: float
+        :param upgrade_prices: Upgrade costs (default is None, the current costs are used).
+        :type upgrade_prices: list[int] or None
+        :return: The index of the next upgrade to buy.
+        :rtype: int
+        """
+        if upgrade_prices is None:
+            upgrade_prices = self.prices
+        return self.choose_upgrade(upgrade_prices, ratio)
+
+    @staticmethod
+    def check_money(money: int, next_upgrade_price: int) -> bool:
+        """
+        Check if you have enough money to buy the next upgrade.
+
+        :param money: Your current money.
+        :type money: int
+        :param next_upgrade_price: The cost of the next upgrade.
+        :type next_upgrade_price: int
+        :return: True if you have enough money, False otherwise.
+        :rtype: bool
+        """
+        return money >= next_upgrade_price
+
+    def toggle_bot_mode(self, event=None) -> None:
+        """
+        Toggle between 'automated' and 'manual' bot modes, like the space bar does in a real game.
+
+        :param event: Unused, kept for the signature of CookieClickerBot.toggle_bot_mode.
+        :type event: Any
+        :return: None
+        """
+        self.bot_mode = "manual" if self.bot_mode == "automated" else "automated"
+
+    def advance(self, seconds: float) -> None:
+        """
+        Let simulated time pass: the buildings produce and the clicker clicks.
+
+        :param seconds: Simulated seconds.
+        :type seconds: float
+        :return: None
+        """
+        self.time += seconds
+        self.money += self.cps * seconds
+        if self.click_enabled and self.bot_mode == "automated":
+            clicks = self.clicks_per_second * seconds
+            self.money += clicks * CLICK_YIELD
+            self.clicks += clicks
+
+    def income(self) -> float:
+        """
+        Retrieve the cookies made every simulated second, by the buildings and the clicker.
+
+        :return: Cookies per second.
+        :rtype: float
+        """
+        income = self.cps
+        if self.click_enabled and self.bot_mode == "automated":
+            income += self.clicks_per_second * CLICK_YIELD
+        return income
+
+    def game(self, ratio: float = None, duration: int = 10) -> float:
+        """
+        Play the game for the specified duration (in simulated seconds), the way CookieClickerBot.game does.
+
+        Each pass through the loop takes one tick. While the next upgrade is not affordable, the simulator skips
+        straight to the tick it becomes affordable, so a whole game takes a handful of steps per purchase.
+
+        :param ratio: The ratio that changes the order of upgrades (default is None).
+        :type ratio: float or None
+        :param duration: The duration of the game in simulated seconds (default is 10 seconds).
+        :type duration: int
+        :return: The final cookies per second (CPS).
+        :rtype: float
+        """
+        end_time = self.time + duration
+
+        while self.time < end_time:
+            if not self.ratio_enabled or self.income() <= 0:  # nothing will happen until the end of the game
+                self.advance(end_time - self.time)
+                break
+
+            self.advance(self.tick)
+            next_upgrade = self.ultimate_strategy(ratio)
+            price = self.prices[next_upgrade]
+            if self.check_money(self.money_value(), price):
+                self.upgrade(next_upgrade)
+            else:  # skip the ticks in which the upgrade is still unaffordable
+                ticks = math.ceil((price - self.money) / (self.income() * self.tick)) - 1
+                ticks = min(ticks, math.ceil((end_time - self.time) / self.tick))
+                if ticks > 0:
+                    self.advance(ticks * self.tick)
+
+        return self.score()
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+
+# Buildings sold in the store, in the order they appear on the webpage (and in the upgrade index).
+BUILDINGS: Tuple[str, ...] = (
+    "Cursor",
+    "Grandma",
+    "Factory",
+    "Mine",
+    "Shipment",
+    "Alchemy lab",
+    "Portal",
+    "Time machine",
+)
+
+# Reads every value the bot needs in a single WebDriver round trip. The raw texts are returned and parsed in Python,
+# so the snapshot is parsed exactly the same way as the single-value scrapers of CookieClickerBot.
+SNAPSHOT_SCRIPT = """
+var text = function (element) { return element ? element.innerText : ''; };
+var tags = document.querySelectorAll('div#store b');
+var prices = [];
+var counts = [];
+for (var i = 0; i < 8; i++) {
+    prices.push(text(tags[i]));
+    counts.push(tags[i] ? text(tags[i].parentNode.querySelector('.amount')) : '');
+}
+return [text(document.querySelector('div#money')), prices, counts, text(document.querySelector('div#cps'))];
+"""
+
+
+@dataclass(frozen=True)
+class GameState:
+    """
+    A parsed snapshot of the game: money, store prices, building counts and cookies per second (CPS).
+    """
+    money: int
+    upgrade_prices: Tuple[int, ...]
+    building_counts: Tuple[int, ...]
+    cps: float
+
+    @classmethod
+    def from_page(cls, money: str, prices: List[str], counts: List[str], cps: str) -> "GameState":
+        """
+        Build a GameState from the raw texts read by SNAPSHOT_SCRIPT.
+
+        :param money: Text of div#money, e.g. "1,234".
+        :type money: str
+        :param prices: Texts of the 'div#store b' tags, e.g. "Cursor - 15".
+        :type prices: list[str]
+        :param counts: Texts of the building amount tags, empty when the building was never bought.
+        :type counts: list[str]
+        :param cps: Text of div#cps, e.g. "per second: 0.2".
+        :type cps: str
+        :return: The parsed game state.
+        :rtype: GameState
+        """
+        return cls(
+            money=int(money.replace(",", "")),
+            upgrade_prices=tuple(int(price.split('- ')[1].replace(",", "")) for price in prices),
+            building_counts=tuple(int(count.replace(",", "").strip() or 0) for count in counts),
+            cps=float(cps.split(': ')[1]),
+        )
+
+    def can_afford(self, upgrade: int) -> bool:
+        """
+        Check if the money in this snapshot covers the price of an upgrade.
+
+        :param upgrade: Index of the upgrade.
+        :type upgrade: int
+        :return: True if the upgrade can be bought, False otherwise.
+        :rtype: bool
+        """
+        return self.money >= self.upgrade_prices[upgrade]
@@ -0,0 +1,63 @@
+import numpy as np
+from typing import List, Sequence
+
+
+# upgrade value = uv: increase in cps compared to the previous upgrade, e.g. if 'upgrade 1' increases cps by 0.8 and
+# 'upgrade 2' increases cps by 4, the uv[2] = 0.8 * 4 = 5
+UPGRADE_VALUES: List[float] = [1, 4, 5, 2.5, 3.5, 7.14, 20, 123.456789]
+
+# The inner loop of ultimate_strategy returns (or breaks) after its first step, so the running product 'cum' it compares
+# with is only ever 1 * uv[j] = uv[j]: the value of a single step. The batched strategy uses them as an array.
+STEP_VALUES: np.ndarray = np.array(UPGRADE_VALUES, dtype=np.float64)
+
+
+def ultimate_strategy(upgrade_prices: Sequence[int], ratio: float) -> int:
+    """
+    Determine the index of the next upgrade to buy based on a strategy.
+
+    This function applies a strategy for choosing when and which upgrade to buy in the game. It only depends on the
+    upgrade prices, so the same strategy drives the bot on the webpage and the simulator.
+
+    :param upgrade_prices: The costs of all the upgrades.
+    :type upgrade_prices: Sequence[int]
+    :param ratio: A ratio that changes the order of upgrades to be bought.
+    :type ratio: float
+    :return: The index of the next upgrade to buy.
+    :rtype: int
+    """
+    uv = UPGRADE_VALUES
+
+    for i in range(len(upgrade_prices) - 1):
+        cum: float = 1
+        for j in range(len(upgrade_prices) - 1 - i, 0, -1):
+            cum *= uv[j]
+            if upgrade_prices[j - 1] * cum * ratio <= upgrade_prices[len(upgrade_prices) - 1 - i]:
+                break
+            return len(upgrade_prices) - 1 - i
+    return 0
+
+
+def ultimate_strategy_batch(upgrade_prices: np.ndarray, ratios: np.ndarray) -> np.ndarray:
+    """
+    Determine the index of the next upgrade to buy for a whole batch of (upgrade prices, ratio) pairs at once.
+
+    Returns the same choices as ultimate_strategy for every pair: the highest upgrade k whose price is lower than
+    the price of upgrade k - 1 times its upgrade value and the ratio, or 0 when there is none. The products are
+    computed in the same order as ultimate_strategy, and prices below 2 ** 53 convert to floats exactly, so the
+    comparisons are bit-identical.
+
+    :param upgrade_prices: Upgrade costs, shape (..., 8), e.g. (N, 8) for N price vectors.
+    :type upgrade_prices: np.ndarray
+    :param ratios: Ratios broadcastable to the leading shape of the prices, e.g. (N,) or a scalar.
+    :type ratios: np.ndarray
+    :return: The indexes of the next upgrades to buy, in the broadcast leading shape.
+    :rtype: np.ndarray
+    """
+    prices = np.asarray(upgrade_prices, dtype=np.float64)
+    ratios = np.asarray(ratios, dtype=np.float64)
+
+    # buy[..., k - 1] is True when ultimate_strategy would return k, if no higher upgrade returned first
+    buy = prices[..., :-1] * STEP_VALUES[1:prices.shape[-1]] * ratios[..., np.newaxis] > prices[..., 1:]
+
+    highest = buy.shape[-1] - np.argmax(buy[..., ::-1], axis=-1)  # the last True, counted from the end
+    return np.where(buy.any(axis=-1), highest, 0)
@@ -0,0 +1,250 @@
+from core.bot import CookieClickerBot
+from core.pool import DriverPool
+from core.score import GameScoreManager
+from core.simulator import CookieClickerSimulator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from multiprocessing.util import Finalize
+import argparse
+from typing import Dict, List, Sequence, Tuple
+
+
+BACKENDS = ("simulated", "browser")
+
+browser_pool: DriverPool = None  # one warm headless browser per worker process, created by init_worker()
+
+
+@dataclass
+class SweepResult:
+    """
+    The CPS reached with every evaluated ratio of a sweep.
+    """
+    duration: int
+    backend: str
+    click_enabled: bool
+    scores: Dict[float, float] = field(default_factory=dict)
+
+    @property
+    def curve(self) -> List[Tuple[float, float]]:
+        """
+        The CPS-vs-ratio curve, sorted by ratio.
+
+        :return: (ratio, CPS) pairs.
+        :rtype: list[tuple[float, float]]
+        """
+        return sorted(self.scores.items())
+
+    @property
+    def best(self) -> Tuple[float, float]:
+        """
+        The ratio with the highest CPS (the lowest ratio on a tie).
+
+        :return: (ratio, CPS) pair.
+        :rtype: tuple[float, float]
+        """
+        return max(self.curve, key=lambda point: (point[1], -point[0]))
+
+    def report(self, width: int = 50) -> str:
+        """
+        Format the curve as a text bar chart, with the best ratio marked.
+
+        :param width: Length of the longest bar in characters (default is 50).
+        :type width: int
+        :return: The report.
+        :rtype: str
+        """
+        best_ratio, best_cps = self.best
+        lines = [f"Best ratio for {self.duration} s ({self.backend}): {best_ratio} -> {best_cps} CPS"]
+        for ratio, cps in self.curve:
+            bar = "#" * round(width * cps / best_cps) if best_cps > 0 else ""
+            marker = " <- best" if ratio == best_ratio else ""
+            lines.append(f"{ratio:>8} {cps:>12} {bar}{marker}")
+        return "\n".join(lines)
+
+
+def init_worker(backend: str) -> None:
+    """
+    Start a worker process of a sweep: with the "browser" backend, its browser session is kept warm between its games.
+
+    :param backend: "simulated" or "browser".
+    :type backend: str
+    :return: None
+    """
+    global browser_pool
+    if backend == "browser":
+        browser_pool = DriverPool(headless=True)
+        Finalize(browser_pool, browser_pool.close, exitpriority=10)  # run when the worker exits, unlike atexit
+
+
+def evaluate(ratio: float, duration: int, backend: str = "simulated", click_enabled: bool = True) -> float:
+    """
+    Play one Buy-Out game with a ratio and return its CPS.
+
+    :param ratio: The ratio for upgrade buying.
+    :type ratio: float
+    :param duration: Duration of the game in seconds.
+    :type duration: int
+    :param backend: "simulated" for the headless simulator or "browser" for a headless Chrome game.
+    :type backend: str
+    :param click_enabled: Indicates whether clicking functionality is enabled (default is True).
+    :type click_enabled: bool
+    :return: The final cookies per second (CPS).
+    :rtype: float
+    """
+    if backend == "simulated":
+        return CookieClickerSimulator(ratio_enabled=True, click_enabled=click_enabled).game(ratio, duration)
+    elif backend == "browser":
+        bot = CookieClickerBot(ratio_enabled=True, click_enabled=click_enabled, headless=True, pool=browser_pool)
+        return bot.game(ratio=ratio, duration=duration, save_score=False)
+    raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+
+def evaluate_all(executor: Executor, result: SweepResult, ratios: Sequence[float]) -> None:
+    """
+    Evaluate the ratios not evaluated yet in parallel and store their CPS in the result.
+
+    :param executor: The pool the games are played on.
+    :type executor: Executor
+    :param result: The sweep the scores are added to.
+    :type result: SweepResult
+    :param ratios: The ratios to evaluate.
+    :type ratios: Sequence[float]
+    :return: None
+    """
+    ratios = [ratio for ratio in dict.fromkeys(ratios) if ratio not in result.scores]
+    chunksize = max(1, len(ratios) // 64) if result.backend == "simulated" else 1  # simulated games take ~1 ms
+    scores = executor.map(evaluate, ratios, repeat(result.duration), repeat(result.backend),
+                          repeat(result.click_enabled), chunksize=chunksize)
+    result.scores.update(zip(ratios, scores))
+
+
+def linspace(low: float, high: float, points: int) -> List[float]:
+    """
+    Spread evenly spaced ratios over an interval, rounded so that they read well in the leaderboard.
+
+    :param low: First ratio.
+    :type low: float
+    :param high: Last ratio.
+    :type high: float
+    :param points: Number of ratios.
+    :type points: int
+    :return: The ratios.
+    :rtype: list[float]
+    """
+    if points == 1:
+        return [round(low, 6)]
+    step = (high - low) / (points - 1)
+    return [round(low + i * step, 6) for i in range(points)]
+
+
+def grid_sweep(duration: int, ratios: Sequence[float], backend: str = "simulated", click_enabled: bool = True,
+               processes: int = None) -> SweepResult:
+    """
+    Evaluate every ratio of a grid across a process pool.
+
+    :param duration: Duration of each game in seconds.
+    :type duration: int
+    :param ratios: The ratios to evaluate.
+    :type ratios: Sequence[float]
+    :param backend: "simulated" or "browser" (default is "simulated").
+    :type backend: str
+    :param click_enabled: Indicates whether clicking functionality is enabled (default is True).
+    :type click_enabled: bool
+    :param processes: Number of worker processes (default is None, one per CPU).
+    :type processes: int or None
+    :return: The sweep result.
+    :rtype: SweepResult
+    """
+    result = SweepResult(duration, backend, click_enabled)
+    with ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(backend,)) as executor:
+        evaluate_all(executor, result, ratios)
+    return result
+
+
+def halving_search(duration: int, low: float = 0.0, high: float = 1.0, points: int = 9, rounds: int = 4,
+                   backend: str = "simulated", click_enabled: bool = True, processes: int = None) -> SweepResult:
+    """
+    Search the best ratio by successive halving: evaluate a grid, then a finer grid around its best ratio, and so on.
+
+    Every round is evaluated in parallel. All the evaluated ratios end up in the curve of the result.
+
+    :param duration: Duration of each game in seconds.
+    :type duration: int
+    :param low: Lowest ratio searched (default is 0.0).
+    :type low: float
+    :param high: Highest ratio searched (default is 1.0).
+    :type high: float
+    :param points: Number of ratios per round (default is 9).
+    :type points: int
+    :param rounds: Number of rounds (default is 4).
+    :type rounds: int
+    :param backend: "simulated" or "browser" (default is "simulated").
+    :type backend: str
+    :param click_enabled: Indicates whether clicking functionality is enabled (default is True).
+    :type click_enabled: bool
+    :param processes: Number of worker processes (default is None, one per CPU).
+    :type processes: int or None
+    :return: The sweep result.
+    :rtype: SweepResult
+    """
+    result = SweepResult(duration, backend, click_enabled)
+    bounds = (low, high)
+    with ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(backend,)) as executor:
+        for _ in range(rounds):
+            evaluate_all(executor, result, linspace(low, high, points))
+            best_ratio = result.best[0]
+            step = (high - low) / max(points - 1, 1)
+            low, high = max(bounds[0], best_ratio - step), min(bounds[1], best_ratio + step)
+    return result
+
+
+def save_sweep(result: SweepResult) -> None:
+    """
+    Add the scores of a sweep to the leaderboard data, tagged as sweep runs.
+
+    :param result: The sweep result.
+    :type result: SweepResult
+    :return: None
+    """
+    score_manager = GameScoreManager()
+    for ratio, cps in result.curve:
+        score_manager.add_score(cps, result.duration, result.click_enabled, True, ratio,
+                                source=f"sweep-{result.backend}")
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Command line entry point: python -m core.sweep --time 60
+
+    :param argv: Command line arguments (default is None, sys.argv is used).
+    :type argv: list[str] or None
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Find the best Buy-Out ratio for a given game time.")
+    parser.add_argument("--time", type=int, required=True, help="game time in seconds")
+    parser.add_argument("--search", choices=("grid", "halving"), default="halving")
+    parser.add_argument("--low", type=float, default=0.0, help="lowest ratio")
+    parser.add_argument("--high", type=float, default=1.0, help="highest ratio")
+    parser.add_argument("--points", type=int, default=21, help="ratios in the grid (per round for halving)")
+    parser.add_argument("--rounds", type=int, default=4, help="rounds of the halving search")
+    parser.add_argument("--backend", choices=BACKENDS, default="simulated")
+    parser.add_argument("--no-clicker", action="store_true", help="play Buy-Out games without the Clicker")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--no-save", action="store_true", help="do not add the scores to the leaderboard data")
+    args = parser.parse_args(argv)
+
+    if args.search == "grid":
+        result = grid_sweep(args.time, linspace(args.low, args.high, args.points), args.backend,
+                            not args.no_clicker, args.processes)
+    else:
+        result = halving_search(args.time, args.low, args.high, args.points, args.rounds, args.backend,
+                                not args.no_clicker, args.processes)
+
+    print(result.report())
+    if not args.no_save:
+        save_sweep(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import numpy as np
+import os
+import time
+from typing import Dict
+
+
+# Columns of the telemetry and their types, chosen to keep the files small.
+COLUMNS: Dict[str, np.dtype] = {
+    "time": np.dtype(np.float32),  # seconds since the start of the game
+    "money": np.dtype(np.float64),  # money grows past the range of 32-bit integers in long games
+    "cps": np.dtype(np.float32),
+    "clicks": np.dtype(np.int64),
+    "building": np.dtype(np.int8),  # index of the building bought at that sample, NO_PURCHASE otherwise
+}
+
+NO_PURCHASE = -1
+
+
+class Telemetry:
+    """
+    Samples of a game (money, CPS, clicks and purchased building) in a preallocated ring buffer.
+
+    Recording a sample writes into the arrays in place, so the game loop never allocates. When the buffer is full
+    the oldest samples are overwritten; at the end of the game the buffer is saved as a compressed columnar file.
+    """
+    def __init__(self, interval: float = 0.5, capacity: int = 8192):
+        """
+        Initialize the Telemetry instance.
+
+        :param interval: Seconds between two periodic samples (default is 0.5).
+        :type interval: float
+        :param capacity: Most samples kept, about an hour of game at the default interval (default is 8192).
+        :type capacity: int
+        """
+        self.interval = interval
+        self.capacity = capacity
+        self.buffers = {name: np.empty(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self.index = 0  # position of the next sample in the buffers
+        self.count = 0  # samples recorded, overwritten ones included
+        self.started_at = 0.0
+        self.next_sample = 0.0
+
+    def start(self, now: float = None) -> None:
+        """
+        Start the game clock of the samples and empty the buffer.
+
+        :param now: time.monotonic() value of the start of the game (default is None, the current time).
+        :type now: float or None
+        :return: None
+        """
+        self.started_at = time.monotonic() if now is None else now
+        self.next_sample = self.started_at
+        self.index = 0
+        self.count = 0
+
+    def due(self, now: float) -> bool:
+        """
+        Check if the next periodic sample is due.
+
+        :param now: time.monotonic() value.
+        :type now: float
+        :return: True if a sample should be recorded, False otherwise.
+        :rtype: bool
+        """
+        return now >= self.next_sample
+
+    def record(self, now: float, money: float, cps: float, clicks: int, building: int = NO_PURCHASE) -> None:
+        """
+        Record a sample, and schedule the next periodic one.
+
+        :param now: time.monotonic() value of the sample.
+        :type now: float
+        :param money: Money at the time of the sample.
+        :type money: float
+        :param cps: Cookies per second at the time of the sample.
+        :type cps: float
+        :param clicks: Clicks on the cookie since the start of the game.
+        :type clicks: int
+        :param building: Index of the building bought at that time (default is NO_PURCHASE).
+        :type building: int
+        :return: None
+        """
+        index = self.index
+        buffers = self.buffers
+        buffers["time"][index] = now - self.started_at
+        buffers["money"][index] = money
+        buffers["cps"][index] = cps
+        buffers["clicks"][index] = clicks
+        buffers["building"][index] = building
+        self.index = index + 1 if index + 1 < self.capacity else 0
+        self.count += 1
+        self.next_sample = now + self.interval
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Retrieve the samples kept, oldest first.
+
+        :return: One array per column.
+        :rtype: dict[str, np.ndarray]
+        """
+        if self.count <= self.capacity:
+            return {name: buffer[:self.count].copy() for name, buffer in self.buffers.items()}
+        return {name: np.roll(buffer, -self.index) for name, buffer in self.buffers.items()}
+
+    def save(self, score_id: int, directory: str = "data/telemetry") -> str:
+        """
+        Write the samples next to the score of the game, as data/telemetry/score-<id>.npz.
+
+        :param score_id: Identifier of the score row of the game.
+        :type score_id: int
+        :param directory: Directory of the telemetry files (default is "data/telemetry").
+        :type directory: str
+        :return: Path of the file.
+        :rtype: str
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"score-{score_id}.npz")
+        np.savez_compressed(path, score_id=score_id, interval=self.interval, dropped=max(self.count - self.capacity, 0),
+                            **self.columns())
+        return path
+
+
+def load_telemetry(score_id: int, directory: str = "data/telemetry") -> Dict[str, np.ndarray]:
+    """
+    Read the samples of a game, e.g. to plot its CPS-over-time curve.
+
+    :param score_id: Identifier of the score row of the game.
+    :type score_id: int
+    :param directory: Directory of the telemetry files (default is "data/telemetry").
+    :type directory: str
+    :return: One array per column, plus the score_id, interval and dropped (overwritten samples) values.
+    :rtype: dict[str, np.ndarray]
+    """
+    with np.load(os.path.join(directory, f"score-{score_id}.npz")) as data:
+        return {name: data[name] for name in data.files}
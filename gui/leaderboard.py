@@ -0,0 +1,170 @@
+import tkinter as tk
+from tkinter import ttk
+from core.score import GameScoreManager
+from gui.summary import SummaryWindow
+from typing import List, Tuple
+
+
+class LeaderboardWindow:
+    """
+    The leaderboard window: a virtualized table that only holds the rows on screen.
+
+    The table has a fixed number of rows whose values are rewritten as the user scrolls; the scores are fetched from
+    the score database a block at a time. By default only the top scores are listed.
+    """
+    COLUMNS = ('CPS', 'Time', 'Mode')
+    VISIBLE_ROWS = 20  # rows on screen
+    BLOCK_ROWS = 200  # rows fetched from the database at once
+    TOP_SCORES = 100  # rows listed until "All scores" is checked, at most BLOCK_ROWS
+
+    def __init__(self, root: tk.Tk, score_manager: GameScoreManager = None):
+        """
+        Initialize the LeaderboardWindow instance and open the window.
+
+        :param root: The main Tkinter root window.
+        :type root: tk.Tk
+        :param score_manager: The scores to list (default is None, a new GameScoreManager is used).
+        :type score_manager: GameScoreManager or None
+        """
+        self.window = tk.Toplevel(root)
+        self.window.title("Leaderboard")
+        self.score_manager = GameScoreManager() if score_manager is None else score_manager
+
+        self.sort_by = 'CPS'
+        self.descending = True
+        self.offset = 0  # index of the first row on screen
+        self.total = 0  # number of rows listed
+        self.block_start = 0  # index of the first row fetched
+        self.block: List[Tuple] = []  # rows fetched
+
+        self.show_all = tk.BooleanVar(value=False)
+        self.create_widgets()
+        self.reload()
+
+    def create_widgets(self) -> None:
+        """
+        Create the table with its scrollbar, the "All scores" option and the button of the summary.
+
+        :return: None
+        """
+        self.tree = ttk.Treeview(self.window, columns=self.COLUMNS, height=self.VISIBLE_ROWS, show="headings")
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column, command=lambda col=column: self.sort_column(col))
+        self.rows = [self.tree.insert("", tk.END, values=()) for _ in range(self.VISIBLE_ROWS)]
+
+        self.scrollbar = ttk.Scrollbar(self.window, orient=tk.VERTICAL, command=self.on_scroll)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_to(self.offset - event.delta // 120))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.offset - 1))  # mouse wheel on Linux
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.offset + 1))
+
+        self.checkbutton_all = tk.Checkbutton(self.window, text="All scores", variable=self.show_all,
+                                              command=self.reload)
+        self.button_summary = tk.Button(self.window, text="Summary",
+                                        command=lambda: SummaryWindow(self.window, self.score_manager))
+
+        self.tree.grid(row=0, column=0)
+        self.scrollbar.grid(row=0, column=1, sticky="NS")
+        self.checkbutton_all.grid(row=1, column=0, sticky="W")
+        self.button_summary.grid(row=1, column=0, sticky="E")
+
+    def reload(self) -> None:
+        """
+        List the scores again from the top, e.g. after the sorting or the "All scores" option changed.
+
+        :return: None
+        """
+        self.offset = 0
+        if self.show_all.get():
+            self.total = self.score_manager.count_scores()
+            self.block = []
+        else:  # the top scores fit in the first block, whose length tells how many there are, without a count
+            self.total = self.TOP_SCORES
+            self.fetch(0)
+            self.total = len(self.block)
+        self.render()
+
+    def fetch(self, start: int) -> None:
+        """
+        Fetch a block of rows from the database, starting a little before the given row.
+
+        :param start: Index of the first row needed.
+        :type start: int
+        :return: None
+        """
+        self.block_start = max(0, start - self.BLOCK_ROWS // 4)  # keep some rows above, for scrolling back up
+        limit = min(self.BLOCK_ROWS, self.total - self.block_start)
+        top = None if self.show_all.get() else self.TOP_SCORES  # the top scores are sorted among themselves
+        page = self.score_manager.get_leaderboard(limit=limit, offset=self.block_start, sort_by=self.sort_by,
+                                                  descending=self.descending, top=top)
+        self.block = list(page[list(self.COLUMNS)].itertuples(index=False, name=None))
+
+    def render(self) -> None:
+        """
+        Show the rows from the current offset, fetching them if they are not in the current block.
+
+        :return: None
+        """
+        end = min(self.offset + self.VISIBLE_ROWS, self.total)
+        if self.offset < self.block_start or end > self.block_start + len(self.block):
+            self.fetch(self.offset)
+
+        for index, item in enumerate(self.rows):
+            position = self.offset + index - self.block_start
+            values = self.block[position] if self.offset + index < end else ()
+            self.tree.item(item, values=values)
+
+        if self.total > 0:
+            self.scrollbar.set(self.offset / self.total, end / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, offset: int) -> None:
+        """
+        Scroll the table so that the given row is the first on screen.
+
+        :param offset: Index of the row.
+        :type offset: int
+        :return: None
+        """
+        offset = max(0, min(offset, self.total - self.VISIBLE_ROWS))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def on_scroll(self, action: str, amount: str, unit: str = None) -> None:
+        """
+        Handle the scrollbar: dragging ("moveto") or the arrows and the trough ("scroll").
+
+        :param action: "moveto" or "scroll".
+        :type action: str
+        :param amount: The fraction to move to, or the number of units to scroll.
+        :type amount: str
+        :param unit: "units" (rows) or "pages", when scrolling.
+        :type unit: str or None
+        :return: None
+        """
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * self.total))
+        elif unit == "pages":
+            self.scroll_to(self.offset + int(amount) * self.VISIBLE_ROWS)
+        else:
+            self.scroll_to(self.offset + int(amount))
+
+    def sort_column(self, col: str) -> None:
+        """
+        Sort the leaderboard by a column. Clicking the same heading again reverses the order.
+
+        The sorting is done by the score database, with typed keys (Mode sorts by category, then by ratio), and only
+        the rows on screen are rendered again.
+
+        :param col: The column to sort by.
+        :type col: str
+        :return: None
+        """
+        if col == self.sort_by:
+            self.descending = not self.descending
+        else:
+            self.sort_by = col
+            self.descending = False
+        self.block = []  # fetched in the previous order
+        self.render()
@@ -0,0 +1,58 @@
+import tkinter as tk
+from core.events import GameEvent
+
+
+class StatsPanel(tk.Frame):
+    """
+    Live statistics of the game in progress: CPS, money, clicks per second, purchases and the last upgrade bought.
+
+    The panel is only updated from the Tkinter mainloop, with the events drained from the EventBus of the game.
+    """
+    FONT = ("Courier", 11)
+    FIELDS = ("CPS", "Money", "Clicks/s", "Purchases", "Last buy")
+    HEIGHT = 120  # pixels added to the window under the timer
+
+    def __init__(self, parent: tk.Misc):
+        """
+        Initialize the StatsPanel instance, with no statistics yet.
+
+        :param parent: The window of the panel.
+        :type parent: tk.Misc
+        """
+        super().__init__(parent, background="black", padx=8, pady=4)
+        self.values = {}
+        for row, name in enumerate(self.FIELDS):
+            tk.Label(self, text=f"{name}:", font=self.FONT, foreground="gray", background="black",
+                     anchor="w").grid(row=row, column=0, sticky="w")
+            self.values[name] = tk.StringVar(value="-")
+            tk.Label(self, textvariable=self.values[name], font=self.FONT, foreground="white", background="black",
+                     anchor="e").grid(row=row, column=1, sticky="e")
+        self.columnconfigure(1, weight=1)
+        self.last_stats: GameEvent = None  # to compute the click rate between two samples
+
+    def show_stats(self, event: GameEvent) -> None:
+        """
+        Display a STATS event.
+
+        :param event: The event.
+        :type event: GameEvent
+        :return: None
+        """
+        data = event.data
+        self.values["CPS"].set(f"{data['cps']:,.1f}")
+        self.values["Money"].set(f"{data['money']:,}")
+        self.values["Purchases"].set(str(data["purchases"]))
+        if self.last_stats is not None and event.time > self.last_stats.time:
+            rate = (data["clicks"] - self.last_stats.data["clicks"]) / (event.time - self.last_stats.time)
+            self.values["Clicks/s"].set(f"{max(rate, 0):.1f}")
+        self.last_stats = event
+
+    def show_purchase(self, event: GameEvent) -> None:
+        """
+        Display a PURCHASE event.
+
+        :param event: The event.
+        :type event: GameEvent
+        :return: None
+        """
+        self.values["Last buy"].set(event.data["building"])
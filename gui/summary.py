@@ -0,0 +1,61 @@
+import tkinter as tk
+from tkinter import ttk
+from core.score import GameScoreManager
+
+
+class SummaryWindow:
+    """
+    The summary window: the statistics of the scores of every game mode (with its ratio) and game time.
+
+    The statistics are kept up to date by the score database as the scores are added, so the window opens as fast
+    after a million games as after ten.
+    """
+    COLUMNS = ('Mode', 'Time', 'Games', 'Mean', 'Std', 'Best', 'Median', 'P90')
+    VISIBLE_ROWS = 20
+
+    def __init__(self, root: tk.Misc, score_manager: GameScoreManager = None):
+        """
+        Initialize the SummaryWindow instance and open the window.
+
+        :param root: The parent window.
+        :type root: tk.Misc
+        :param score_manager: The scores to summarize (default is None, a new GameScoreManager is used).
+        :type score_manager: GameScoreManager or None
+        """
+        self.window = tk.Toplevel(root)
+        self.window.title("Summary")
+        self.score_manager = GameScoreManager() if score_manager is None else score_manager
+        self.include_sweeps = tk.BooleanVar(value=False)
+        self.create_widgets()
+        self.reload()
+
+    def create_widgets(self) -> None:
+        """
+        Create the table with its scrollbar, and the "Sweeps" option.
+
+        :return: None
+        """
+        self.tree = ttk.Treeview(self.window, columns=self.COLUMNS, height=self.VISIBLE_ROWS, show="headings")
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=140 if column == 'Mode' else 70, anchor="w" if column == 'Mode' else "e")
+        self.scrollbar = ttk.Scrollbar(self.window, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+
+        self.checkbutton_sweeps = tk.Checkbutton(self.window, text="Sweeps", variable=self.include_sweeps,
+                                                 command=self.reload)
+
+        self.tree.grid(row=0, column=0)
+        self.scrollbar.grid(row=0, column=1, sticky="NS")
+        self.checkbutton_sweeps.grid(row=1, column=0, sticky="W")
+
+    def reload(self) -> None:
+        """
+        List the statistics again, e.g. after the "Sweeps" option changed.
+
+        :return: None
+        """
+        self.tree.delete(*self.tree.get_children())
+        summary = self.score_manager.get_stats(include_sweeps=self.include_sweeps.get())
+        for row in summary[list(self.COLUMNS)].itertuples(index=False, name=None):
+            self.tree.insert("", tk.END, values=row)
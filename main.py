@@ -1,9 +1,11 @@
+from core.app_logic import preload_modules
 from gui.gui import CookieClickerBotApp
 import tkinter as tk
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = CookieClickerBotApp(root)
+    root.after_idle(preload_modules)  # once the window is drawn, import selenium and pandas in the background
     root.mainloop()
 
 # TODO 1️: Message displaying after 1 game instance- not sure if needed.
@@ -0,0 +1,39 @@
+import threading
+from core.events import EventBus, FINISHED, PURCHASE, READY, STATS
+
+
+def test_drain_keeps_the_order_and_only_the_newest_stats():
+    bus = EventBus()
+    bus.publish(READY, deadline=1.0)
+    bus.publish(STATS, clicks=1)
+    bus.publish(PURCHASE, building="Cursor")
+    bus.publish(STATS, clicks=2)
+    events = bus.drain()
+    assert [event.kind for event in events] == [READY, PURCHASE, STATS]
+    assert events[-1].data == {"clicks": 2}
+    assert bus.dropped == 1
+    assert bus.drain() == []
+
+
+def test_drain_hands_over_at_most_the_limit():
+    bus = EventBus(limit=3)
+    for building in range(5):
+        bus.publish(PURCHASE, building=building)
+    assert [event.data["building"] for event in bus.drain()] == [0, 1, 2]
+    assert [event.data["building"] for event in bus.drain()] == [3, 4]
+
+
+def test_events_published_from_another_thread_are_drained():
+    bus = EventBus()
+
+    def game() -> None:
+        for clicks in range(100):
+            bus.publish(STATS, clicks=clicks)
+        bus.publish(FINISHED, cps=1.0, score_id=None)
+
+    thread = threading.Thread(target=game)
+    thread.start()
+    thread.join()
+    events = bus.drain()
+    assert [event.kind for event in events] == [STATS, FINISHED]
+    assert events[0].data == {"clicks": 99}
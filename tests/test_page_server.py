@@ -0,0 +1,21 @@
+import pytest
+from core.page_server import find_assets, local_url
+
+
+def test_find_assets_in_a_page():
+    page = """<link rel="stylesheet" href="style.css?v=2"><script src='main.js'></script>
+              <img src="img/cookie.png#x"><script src="https://cdn.example.com/lib.js"></script>
+              <a href="//example.com/page.html"></a>"""
+    assert find_assets(page) == {"style.css", "main.js", "img/cookie.png"}
+
+
+def test_find_assets_in_a_style_sheet_and_a_script():
+    style = "div { background: url('img/bg.jpg'); } b { background: url(img/icon.svg) }"
+    assert find_assets(style) == {"img/bg.jpg", "img/icon.svg"}
+    script = "var sounds = ['snd/click.mp3', \"snd/buy.ogg\"]; var text = 'not.an.asset';"
+    assert find_assets(script) == {"snd/click.mp3", "snd/buy.ogg"}
+
+
+def test_local_url_needs_a_snapshot(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        local_url(str(tmp_path))
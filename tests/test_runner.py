@@ -0,0 +1,23 @@
+from core import runner
+from core.runner import GameConfig, config_matrix, max_parallel_games
+
+
+def test_ratios_only_apply_to_the_buy_out_games():
+    configs = config_matrix(clicker=(True,), buy_out=(True, False), ratios=(0.25, 0.75), durations=(30,))
+    assert configs == [GameConfig(True, True, 30, 0.25), GameConfig(True, True, 30, 0.75), GameConfig(True, False, 30)]
+
+
+def test_every_combination_is_repeated():
+    configs = config_matrix(durations=(10, 60), repeats=3)
+    assert len(configs) == 2 * 2 * 2 * 3
+    assert configs[:3] == [GameConfig(True, True, 10, 0.5)] * 3
+
+
+def test_parallel_games_are_capped_by_the_memory(monkeypatch):
+    monkeypatch.setattr(runner.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(runner, "available_memory", lambda: 3 * runner.MEMORY_PER_GAME)
+    assert max_parallel_games() == 3
+    monkeypatch.setattr(runner, "available_memory", lambda: 0)
+    assert max_parallel_games() == 1  # at least one game is played
+    monkeypatch.setattr(runner, "available_memory", lambda: None)
+    assert max_parallel_games() == 8
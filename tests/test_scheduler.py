@@ -0,0 +1,60 @@
+from core.scheduler import DecisionController, PurchaseScheduler
+from core.state import GameState
+
+
+def state(money: int, cps: float = 0.0) -> GameState:
+    return GameState(money=money, upgrade_prices=(15,) * 8, building_counts=(0,) * 8, cps=cps)
+
+
+def test_scheduler_probes_the_click_yield_first():
+    scheduler = PurchaseScheduler(probe=0.1)
+    assert scheduler.due(0.0)
+    scheduler.plan(state(0), price=100, now=0.0)
+    assert scheduler.next_check == 0.1
+    assert not scheduler.due(0.05)
+    assert scheduler.stats() == {"checks": 1, "skips": 1}
+
+
+def test_scheduler_waits_until_the_upgrade_is_affordable():
+    scheduler = PurchaseScheduler(margin=0.05, max_wait=10.0)
+    scheduler.plan(state(0, cps=10), price=100, now=0.0)
+    scheduler.plan(state(20, cps=10), price=100, now=1.0)  # 10 cookies/s from the buildings, 10 from the clicks
+    assert scheduler.click_income == 10
+    assert abs(scheduler.next_check - (1.0 + 80 / 20 - 0.05)) < 1e-9
+
+
+def test_scheduler_caps_the_wait():
+    scheduler = PurchaseScheduler(max_wait=1.0)
+    scheduler.plan(state(0, cps=1), price=10 ** 9, now=0.0)
+    scheduler.plan(state(1, cps=1), price=10 ** 9, now=1.0)
+    assert scheduler.next_check == 2.0
+
+
+def test_scheduler_replan_reads_on_the_next_pass():
+    scheduler = PurchaseScheduler()
+    scheduler.plan(state(0), price=100, now=0.0)
+    scheduler.plan(state(10), price=100, now=1.0)
+    scheduler.replan(reset_income=True)
+    assert scheduler.due(1.0)
+    assert scheduler.click_income is None
+
+
+def test_controller_spaces_out_evaluations_while_clicks_make_the_income():
+    controller = DecisionController(min_passes=1, max_passes=21, smoothing=1.0)
+    controller.start(0.0)
+    assert controller.due()  # the first pass evaluates
+    controller.update(cps=0.0, click_income=10.0, now=1.0)
+    assert controller.passes == 21
+    assert [controller.due() for _ in range(21)] == [False] * 20 + [True]
+
+    controller.update(cps=10.0, click_income=0.0, now=2.0)
+    assert controller.passes == 1
+    assert controller.schedule == [(0.0, 1), (1.0, 21), (2.0, 1)]
+
+
+def test_controller_keeps_its_passes_until_the_click_yield_is_known():
+    controller = DecisionController(min_passes=2, max_passes=20)
+    controller.start(0.0)
+    controller.update(cps=5.0, click_income=None, now=1.0)
+    assert controller.passes == 2
+    assert controller.stats() == {"passes": 2, "click_share": None, "changes": 0}
@@ -0,0 +1,140 @@
+import numpy as np
+import sqlite3
+import pytest
+from core.score import GameScoreManager, QuantileSketch, parse_mode
+
+
+@pytest.fixture
+def manager(tmp_path) -> GameScoreManager:
+    return GameScoreManager(str(tmp_path / "score.db"), str(tmp_path / "score.csv"))
+
+
+def test_csv_scores_are_imported_once(tmp_path):
+    csv_path = tmp_path / "score.csv"
+    csv_path.write_text("CPS,Time,Mode\n12.5,60,Buy-Out[0.5]\n3.0,60,Clicker\n")
+    for _ in range(2):
+        manager = GameScoreManager(str(tmp_path / "score.db"), str(csv_path))
+    leaderboard = manager.get_leaderboard()
+    assert leaderboard["CPS"].tolist() == [12.5, 3.0]
+    assert set(leaderboard["Source"]) == {"game"}
+
+
+def test_scores_are_appended(manager):
+    first = manager.add_score(1.0, 10, True, False)
+    second = manager.add_score(2.0, 10, False, False)
+    assert second == first + 1
+    assert manager.get_leaderboard()["Mode"].tolist() == ["Manual", "Clicker"]
+    manager.add_score(3.0, 10, False, True, 0.5, source="sweep-simulated")
+    assert manager.count_scores() == 2 and manager.count_scores(include_sweeps=True) == 3
+
+
+def test_parse_mode():
+    assert parse_mode("Buy-Out[0.625]") == ("Buy-Out", 0.625)
+    assert parse_mode("Full-Auto[None]") == ("Full-Auto", None)
+    assert parse_mode("Clicker") == ("Clicker", None)
+
+
+def test_modes_sort_by_category_then_numeric_ratio(manager):
+    for ratio in (0.5, 0.125, 0.75):
+        manager.add_score(1.0, 10, False, True, ratio)
+    manager.add_score(1.0, 10, True, False)
+    modes = manager.get_leaderboard(sort_by="Mode", descending=False)["Mode"].tolist()
+    assert modes == ["Buy-Out[0.125]", "Buy-Out[0.5]", "Buy-Out[0.75]", "Clicker"]
+
+
+def test_top_scores_are_sorted_among_themselves(manager):
+    for cps, time in ((5.0, 30), (1.0, 10), (4.0, 60), (3.0, 20)):
+        manager.add_score(cps, time, True, False)
+    by_cps = manager.get_leaderboard(sort_by="CPS", descending=False, top=3)
+    assert by_cps["CPS"].tolist() == [3.0, 4.0, 5.0]  # the top 3 reversed, not the 3 worst
+    by_time = manager.get_leaderboard(sort_by="Time", top=3)
+    assert by_time["Time"].tolist() == [60, 30, 20]
+    assert len(manager.get_leaderboard(top=3, offset=2)) == 1
+
+def test_unknown_sort_column_is_rejected(manager):
+    with pytest.raises(ValueError):
+        manager.get_leaderboard(sort_by="Source")
+
+
+def test_aggregates_match_the_scores(manager):
+    rng = np.random.default_rng(0)
+    scores = rng.uniform(1, 1000, 200)
+    for cps in scores:
+        manager.add_score(float(cps), 60, False, True, 0.5)
+    manager.add_score(50.0, 60, False, True, 0.5, source="sweep-simulated")
+
+    stats = manager.get_stats().iloc[0]
+    assert stats["Mode"] == "Buy-Out[0.5]" and stats["Games"] == 200
+    assert stats["Mean"] == round(scores.mean(), 1)
+    assert stats["Std"] == round(scores.std(ddof=1), 1)
+    assert stats["Best"] == round(scores.max(), 1)
+    assert stats["Median"] == pytest.approx(np.percentile(scores, 50, method="inverted_cdf"), rel=0.02)
+    assert stats["P90"] == pytest.approx(np.percentile(scores, 90, method="inverted_cdf"), rel=0.02)
+    assert manager.get_stats(include_sweeps=True).iloc[0]["Games"] == 201
+
+
+def test_quantiles_stay_within_the_scores(manager):
+    manager.add_score(10.04, 60, True, False)  # the middle of its bucket is above the score
+    manager.add_score(10.04, 60, True, False)
+    stats = manager.get_stats().iloc[0]
+    assert stats["Median"] == stats["P90"] == stats["Best"] == 10.0
+    for _ in range(3):  # the middle of its bucket is below the score, and the sweeps hold the worst score
+        manager.add_score(9.97, 60, True, False, source="sweep-simulated")
+    assert manager.get_stats(include_sweeps=True).iloc[0]["Median"] == 10.0
+
+
+def test_sketch_quantiles_are_nearest_rank():
+    def quantile(values, fraction):
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+        return sketch.quantile(fraction)
+
+    assert quantile([1, 1, 1, 1, 10], 0.9) == pytest.approx(10, rel=0.01)
+    assert quantile([0.2, 0.2, 0.4], 0.9) == pytest.approx(0.4, rel=0.01)
+    assert quantile(range(1, 11), 0.9) == pytest.approx(9, rel=0.01)
+    assert quantile([0, 0, 5], 0.5) == 0.0
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_sketch_round_trips_through_json():
+    sketch = QuantileSketch()
+    for value in (0, 1.5, 20, 300):
+        sketch.add(value)
+    restored = QuantileSketch.from_json(sketch.to_json())
+    assert restored.buckets == sketch.buckets and restored.zeros == sketch.zeros
+    assert restored.quantile(0.5) == sketch.quantile(0.5)
+
+
+def test_older_database_is_migrated(tmp_path):
+    path = str(tmp_path / "score.db")
+    with sqlite3.connect(path) as connection:  # as saved before the aggregates and the page existed
+        connection.executescript("""
+            CREATE TABLE scores (id INTEGER PRIMARY KEY, CPS REAL NOT NULL, Time INTEGER NOT NULL, Mode TEXT NOT NULL,
+                                 Source TEXT NOT NULL DEFAULT 'game', Category TEXT, Ratio REAL);
+            INSERT INTO scores (CPS, Time, Mode, Source, Category, Ratio) VALUES
+                (5.0, 60, 'Clicker', 'game', 'Clicker', NULL), (7.0, 60, 'Clicker', 'game', 'Clicker', NULL);
+            PRAGMA user_version = 2;
+        """)
+    manager = GameScoreManager(path, str(tmp_path / "score.csv"))
+    manager.add_score(9.0, 60, True, False, page="remote")
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("PRAGMA user_version").fetchone()[0] == 5
+        assert connection.execute("SELECT Page FROM scores ORDER BY id").fetchall() == [(None,), (None,), ("remote",)]
+    stats = manager.get_stats().iloc[0]
+    assert (stats["Mode"], stats["Games"], stats["Mean"], stats["Best"]) == ("Clicker", 3, 7.0, 9.0)
+
+
+def test_aggregates_without_the_worst_score_are_migrated(tmp_path):
+    path = str(tmp_path / "score.db")
+    manager = GameScoreManager(path, str(tmp_path / "score.csv"))
+    manager.add_score(4.0, 60, True, False)
+    manager.add_score(3.0, 60, True, False)
+    with sqlite3.connect(path) as connection:  # as saved before the worst score was kept
+        connection.executescript("ALTER TABLE score_stats DROP COLUMN Worst; PRAGMA user_version = 4;")
+
+    manager = GameScoreManager(path, str(tmp_path / "score.csv"))
+    manager.add_score(5.0, 60, True, False)
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT Worst FROM score_stats").fetchall() == [(3.0,)]
@@ -0,0 +1,35 @@
+import pytest
+from core.simulator import CookieClickerSimulator
+
+
+def play_every_tick(simulator: CookieClickerSimulator, ratio: float, duration: int) -> float:
+    # CookieClickerSimulator.game without skipping the ticks in which the next upgrade is unaffordable
+    end_time = simulator.time + duration
+    while simulator.time < end_time:
+        simulator.advance(simulator.tick)
+        next_upgrade = simulator.ultimate_strategy(ratio)
+        if simulator.check_money(simulator.money_value(), simulator.prices[next_upgrade]):
+            simulator.upgrade(next_upgrade)
+    return simulator.score()
+
+
+@pytest.mark.parametrize("ratio", [0.0, 0.25, 0.5, 1.0])
+def test_skipping_ahead_buys_what_a_tick_by_tick_game_buys(ratio):
+    skipping = CookieClickerSimulator(ratio_enabled=True, click_enabled=True)
+    ticking = CookieClickerSimulator(ratio_enabled=True, click_enabled=True)
+    assert skipping.game(ratio, 60) == play_every_tick(ticking, ratio, 60)
+    assert skipping.counts == ticking.counts and sum(skipping.counts) > 0
+
+
+def test_nothing_is_bought_without_an_income():
+    simulator = CookieClickerSimulator(ratio_enabled=True, click_enabled=False)
+    assert simulator.game(0.5, 60) == 0
+    assert simulator.time == 60 and sum(simulator.counts) == 0
+
+
+def test_manual_mode_stops_the_clicker():
+    simulator = CookieClickerSimulator(ratio_enabled=False, click_enabled=True, clicks_per_second=10)
+    simulator.advance(1)
+    simulator.toggle_bot_mode()
+    simulator.advance(1)
+    assert simulator.money_value() == 10 and simulator.income() == 0
@@ -0,0 +1,17 @@
+from core.state import GameState
+
+
+def test_from_page_parses_the_texts_of_the_webpage():
+    state = GameState.from_page("1,234", ["Cursor - 15", "Grandma - 1,100"], ["3", ""], "per second: 0.2")
+    assert state == GameState(money=1234, upgrade_prices=(15, 1100), building_counts=(3, 0), cps=0.2)
+
+
+def test_from_page_reads_large_counts_and_cps():
+    state = GameState.from_page("12,345,678", ["Portal - 1,000,000"], [" 1,024 "], "per second: 15.3")
+    assert state == GameState(money=12345678, upgrade_prices=(1000000,), building_counts=(1024,), cps=15.3)
+
+
+def test_can_afford():
+    state = GameState(money=100, upgrade_prices=(15, 100, 500), building_counts=(0, 0, 0), cps=0.0)
+    assert state.can_afford(0) and state.can_afford(1)
+    assert not state.can_afford(2)
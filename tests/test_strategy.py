@@ -0,0 +1,45 @@
+import numpy as np
+from core.strategy import UPGRADE_VALUES, ultimate_strategy, ultimate_strategy_batch
+
+
+def scalar_choices(prices: np.ndarray, ratios: np.ndarray) -> np.ndarray:
+    return np.array([ultimate_strategy(row.tolist(), ratio) for row, ratio in zip(prices, ratios)])
+
+
+def test_batch_matches_scalar_on_random_prices():
+    rng = np.random.default_rng(0)
+    prices = rng.integers(1, 10 ** 9, size=(20000, 8)).astype(np.float64)
+    ratios = rng.random(20000)
+    assert np.array_equal(ultimate_strategy_batch(prices, ratios), scalar_choices(prices, ratios))
+
+
+def test_batch_matches_scalar_on_game_like_prices():
+    # growing prices, as in the store, with the ratios at the ends of the range
+    rng = np.random.default_rng(1)
+    base = np.array([15, 100, 500, 2000, 7000, 50000, 1000000, 123456789], dtype=np.float64)
+    prices = np.floor(base * rng.uniform(1, 20, size=(5000, 8)))
+    ratios = rng.choice([0.0, 1e-9, 0.25, 0.5, 1.0], size=5000)
+    assert np.array_equal(ultimate_strategy_batch(prices, ratios), scalar_choices(prices, ratios))
+
+
+def test_batch_matches_scalar_at_equality_boundaries():
+    # the price of upgrade k exactly at, just below and just above price[k - 1] * value[k] * ratio
+    rng = np.random.default_rng(2)
+    rows, ratios = [], []
+    for _ in range(500):
+        ratio = float(rng.choice([0.1, 0.25, 0.5, 0.75, 1.0]))
+        row = rng.integers(1, 10 ** 6, size=8).astype(np.float64)
+        k = int(rng.integers(1, 8))
+        boundary = row[k - 1] * UPGRADE_VALUES[k] * ratio
+        for price in (boundary, np.nextafter(boundary, 0), np.nextafter(boundary, np.inf)):
+            boundary_row = row.copy()
+            boundary_row[k] = price
+            rows.append(boundary_row)
+            ratios.append(ratio)
+    prices, ratios = np.array(rows), np.array(ratios)
+    assert np.array_equal(ultimate_strategy_batch(prices, ratios), scalar_choices(prices, ratios))
+
+
+def test_batch_broadcasts_a_scalar_ratio():
+    prices = np.array([[15, 100, 500, 2000, 7000, 50000, 1000000, 123456789]] * 3)
+    assert ultimate_strategy_batch(prices, 0.5).tolist() == [ultimate_strategy(prices[0].tolist(), 0.5)] * 3
@@ -0,0 +1,14 @@
+from core.sweep import SweepResult, linspace
+
+
+def test_best_ratio_takes_the_lowest_ratio_on_a_tie():
+    result = SweepResult(60, "simulated", True, scores={0.75: 30.0, 0.25: 30.0, 0.5: 20.0})
+    assert result.curve == [(0.25, 30.0), (0.5, 20.0), (0.75, 30.0)]
+    assert result.best == (0.25, 30.0)
+    assert result.report().splitlines()[1].endswith("<- best")
+
+
+def test_linspace_includes_both_ends():
+    assert linspace(0, 1, 5) == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert linspace(0.1, 0.3, 3) == [0.1, 0.2, 0.3]  # rounded, not 0.30000000000000004
+    assert linspace(0.5, 1, 1) == [0.5]
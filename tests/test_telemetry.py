@@ -0,0 +1,37 @@
+import numpy as np
+from core.telemetry import NO_PURCHASE, Telemetry, load_telemetry
+
+
+def test_samples_are_kept_in_order_until_the_buffer_is_full():
+    telemetry = Telemetry(interval=0.5, capacity=4)
+    telemetry.start(10.0)
+    assert telemetry.due(10.0)
+    telemetry.record(10.0, money=0, cps=0.0, clicks=0)
+    assert not telemetry.due(10.4) and telemetry.due(10.5)
+    telemetry.record(10.5, money=15, cps=0.2, clicks=15, building=0)
+    columns = telemetry.columns()
+    assert columns["time"].tolist() == [0.0, 0.5]
+    assert columns["building"].tolist() == [NO_PURCHASE, 0]
+
+
+def test_the_oldest_samples_are_overwritten_when_the_ring_wraps_around():
+    telemetry = Telemetry(capacity=4)
+    telemetry.start(0.0)
+    for clicks in range(6):
+        telemetry.record(float(clicks), money=clicks * 10, cps=0.0, clicks=clicks)
+    columns = telemetry.columns()
+    assert columns["clicks"].tolist() == [2, 3, 4, 5]
+    assert columns["money"].tolist() == [20, 30, 40, 50]
+    assert columns["time"].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_saved_samples_are_read_back(tmp_path):
+    telemetry = Telemetry(capacity=2)
+    telemetry.start(0.0)
+    for clicks in range(3):
+        telemetry.record(float(clicks), money=1e12, cps=1.5, clicks=clicks)
+    telemetry.save(7, str(tmp_path))
+    samples = load_telemetry(7, str(tmp_path))
+    assert samples["clicks"].tolist() == [1, 2]
+    assert np.all(samples["money"] == 1e12)
+    assert int(samples["dropped"]) == 1